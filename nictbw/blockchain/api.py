@@ -2,7 +2,7 @@ import os
 from pathlib import Path
 from dotenv import load_dotenv
 from urllib.parse import urljoin
-from typing import Any, Optional, Mapping
+from typing import Any, Optional, Mapping, Protocol
 
 from .utils import open_session, get_jwt_token
 
@@ -27,6 +27,16 @@ def _default_nft_file_path() -> str:
     )
 
 
+class NFTInstanceSource(Protocol):
+    """Anything that can list a user's on-chain NFT instances.
+
+    :class:`ChainClient` satisfies this protocol; tests and offline tooling can
+    pass any object with a matching ``get_user_nft_instances`` method.
+    """
+
+    def get_user_nft_instances(self, username: str) -> list[dict]: ...
+
+
 class ChainClient:
     """Client for interacting with the blockchain service.
 
@@ -29,6 +29,24 @@ if TYPE_CHECKING:
     from .prize_draw import RaffleEntry
 
 
+# Rows, columns and diagonals of a 3x3 card, by cell index.
+_WINNING_LINES: tuple[tuple[int, int, int], ...] = (
+    (0, 1, 2),
+    (3, 4, 5),
+    (6, 7, 8),
+    (0, 3, 6),
+    (1, 4, 7),
+    (2, 5, 8),
+    (0, 4, 8),
+    (2, 4, 6),
+)
+# Bit ``idx`` of a mask is set when cell ``idx`` is unlocked.
+_WINNING_LINE_MASKS = tuple(
+    (line, (1 << line[0]) | (1 << line[1]) | (1 << line[2]))
+    for line in _WINNING_LINES
+)
+
+
 class BingoPeriod(Base):
     """Bingo season/window."""
 
@@ -342,16 +360,16 @@ class BingoCard(Base):
     @property
     def winning_lines(self) -> list[tuple[int, int, int]]:
         """Get all possible winning line combinations for a 3x3 bingo card."""
-        return [
-            (0, 1, 2),
-            (3, 4, 5),
-            (6, 7, 8),
-            (0, 3, 6),
-            (1, 4, 7),
-            (2, 5, 8),
-            (0, 4, 8),
-            (2, 4, 6),
-        ]
+        return list(_WINNING_LINES)
+
+    @property
+    def unlocked_mask(self) -> int:
+        """Bitmask of unlocked cells, with bit ``idx`` set for cell ``idx``."""
+        mask = 0
+        for cell in self.cells:
+            if cell.state == "unlocked":
+                mask |= 1 << cell.idx
+        return mask
 
     @property
     def completed_lines(self) -> list[tuple[int, int, int]]:
@@ -361,17 +379,12 @@ class BingoCard(Base):
         completed lines. Each tuple represents the positions of cells in a winning
         line that are all in ``"unlocked"`` state.
         """
-        # Create a mapping from idx to cell for safe access
-        cell_map = {cell.idx: cell for cell in self.cells}
-        
-        result: list[tuple[int, int, int]] = []
-        for a, b, c in self.winning_lines:
-            if (a in cell_map and b in cell_map and c in cell_map and
-                cell_map[a].state == "unlocked" and
-                cell_map[b].state == "unlocked" and
-                cell_map[c].state == "unlocked"):
-                result.append((a, b, c))
-        return result
+        mask = self.unlocked_mask
+        return [
+            line
+            for line, line_mask in _WINNING_LINE_MASKS
+            if mask & line_mask == line_mask
+        ]
 
     def unlock_cells_for_nft_instance(
         self, session: Session, nft_instance: "NFTInstance"
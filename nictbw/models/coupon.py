@@ -155,9 +155,13 @@ class NFTCouponBinding(Base):
     def get_by_definition_and_template(
         cls, session: Session, definition_id: int, template_id: int
     ) -> Optional["NFTCouponBinding"]:
-        stmt = select(cls).where(
-            cls.definition_id == definition_id,
-            cls.template_id == template_id,
+        stmt = (
+            select(cls)
+            .where(
+                cls.definition_id == definition_id,
+                cls.template_id == template_id,
+            )
+            .limit(1)
         )
         return session.scalar(stmt)
 
@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from datetime import datetime, timezone
-from typing import Optional, TYPE_CHECKING
+from typing import Any, Optional, TYPE_CHECKING
 
 from sqlalchemy import (
     BigInteger,
@@ -286,6 +286,25 @@ class NFTTemplate(Base):
         UniqueConstraint("prefix", name="nft_templates_prefix_key"),
     )
 
+    def _definition_defaults(self) -> dict[str, Any]:
+        """Return the :class:`NFTDefinition` fields copied from this template."""
+
+        return {
+            "template_id": self.id,
+            "prefix": self.prefix,
+            "name": self.name,
+            "nft_type": "default",
+            "category": self.category,
+            "subcategory": self.subcategory,
+            "description": self.description,
+            "image_url": self.image_url,
+            "condition_id": self.default_condition_id,
+            "max_supply": self.max_supply,
+            "status": self.status,
+            "triggers_bingo_card": self.triggers_bingo_card,
+            "created_by_admin_id": self.created_by_admin_id,
+        }
+
     def instantiate_instance(
         self,
         session: Session,
@@ -310,27 +329,22 @@ class NFTTemplate(Base):
         from .ownership import NFTInstance
 
         definition = session.scalar(
-            select(NFTDefinition).where(
+            select(NFTDefinition)
+            .where(
                 (NFTDefinition.template_id == self.id) | (NFTDefinition.prefix == self.prefix)
             )
+            .limit(1)
         )
         if definition is None:
-            definition = NFTDefinition(
-                template_id=self.id,
-                prefix=self.prefix,
-                shared_key=shared_key,
-                name=override_name or self.name,
-                nft_type="default",
-                category=self.category,
-                subcategory=self.subcategory,
-                description=override_description or self.description,
-                image_url=self.image_url,
-                condition_id=self.default_condition_id,
-                max_supply=self.max_supply,
-                status=self.status,
-                triggers_bingo_card=self.triggers_bingo_card,
-                created_by_admin_id=override_created_by_admin_id or self.created_by_admin_id,
-            )
+            fields = self._definition_defaults()
+            fields["shared_key"] = shared_key
+            if override_name:
+                fields["name"] = override_name
+            if override_description:
+                fields["description"] = override_description
+            if override_created_by_admin_id:
+                fields["created_by_admin_id"] = override_created_by_admin_id
+            definition = NFTDefinition(**fields)
             session.add(definition)
             session.flush()
 
@@ -352,5 +366,5 @@ class NFTTemplate(Base):
 
     @classmethod
     def get_by_name(cls, session: Session, name: str) -> Optional["NFTTemplate"]:
-        stmt = select(cls).where(cls.name == name)
+        stmt = select(cls).where(cls.name == name).limit(1)
         return session.scalar(stmt)
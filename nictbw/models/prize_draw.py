@@ -98,8 +98,9 @@ class PrizeDrawType(Base):
                 PrizeDrawWinningNumber.created_at.desc(),
                 PrizeDrawWinningNumber.id.desc(),
             )
+            .limit(1)
         )
-        return session.scalars(stmt).first()
+        return session.scalar(stmt)
 
     def __init__(
         self,
@@ -5,14 +5,22 @@ import json
 from typing import TYPE_CHECKING, Optional, Any
 
 from sqlalchemy import Boolean, DateTime, String, func, select, text, UniqueConstraint
-from sqlalchemy.orm import Session, Mapped, mapped_column, relationship, synonym, validates
+from sqlalchemy.orm import (
+    Session,
+    Mapped,
+    mapped_column,
+    relationship,
+    selectinload,
+    synonym,
+    validates,
+)
 
 from .id_type import ID_TYPE
 from .base import Base
 from .ownership import NFTInstance
 
 if TYPE_CHECKING:
-    from ..blockchain.api import ChainClient
+    from ..blockchain.api import NFTInstanceSource
     from .bingo import BingoCard
     from .coupon import CouponInstance
     from .nft import NFTDefinition
@@ -228,10 +236,12 @@ class User(Base):
 
         unlocked_any = False
         cards = session.scalars(
-            select(BingoCard).where(
+            select(BingoCard)
+            .where(
                 BingoCard.user_id == self.id,
                 BingoCard.state == "active",
             )
+            .options(selectinload(BingoCard.cells))
         ).all()
         for card in cards:
             if card.unlock_cells_for_nft_instance(session, nft_instance):
@@ -323,12 +333,10 @@ class User(Base):
         """
 
         from sqlalchemy import select
+        from .bingo import BingoCard
         from .ownership import NFTInstance
         from .nft import NFTDefinition
 
-        # Reload relationships to capture newly created cards or instances
-        session.expire(self, ["bingo_cards", "nft_instances"])
-
         # Map definition_id -> instance for quick lookup
         instances = session.scalars(
             select(NFTInstance)
@@ -337,10 +345,14 @@ class User(Base):
         ).all()
         instance_map = {inst.definition_id: inst for inst in instances}
 
+        cards = session.scalars(
+            select(BingoCard)
+            .where(BingoCard.user_id == self.id, BingoCard.state == "active")
+            .options(selectinload(BingoCard.cells))
+        ).all()
+
         unlocked = 0
-        for card in self.bingo_cards:
-            if card.state != "active":
-                continue
+        for card in cards:
             card_unlocked = False
             for cell in card.cells:
                 if cell.state == "locked":
@@ -386,7 +398,7 @@ class User(Base):
         return self.password_hash is not None and self.password_hash == password_hash
 
     def sync_nft_instances_from_chain(
-        self, session: Session, client: Optional["ChainClient"] = None
+        self, session: Session, client: Optional["NFTInstanceSource"] = None
     ) -> None:
         """Refresh this user's NFT instances using the blockchain API.
 
@@ -394,8 +406,10 @@ class User(Base):
         ----------
         session : Session
             Active SQLAlchemy session used to query and persist changes.
-        client : Optional[ChainClient]
-            Pre-initialized blockchain client. If ``None``, a new client is created.
+        client : Optional[NFTInstanceSource]
+            Pre-initialized blockchain client, or any object providing
+            ``get_user_nft_instances``. If ``None``, a new
+            :class:`~nictbw.blockchain.api.ChainClient` is created.
 
         Raises
         ------
@@ -10,6 +10,13 @@ from sqlalchemy.orm import Session
 BASE62_ALPHABET = string.digits + string.ascii_uppercase + string.ascii_lowercase
 
 
+def _random_suffix(length: int) -> str:
+    """Return ``length`` cryptographically random base62 characters."""
+
+    choice = secrets.choice
+    return "".join([choice(BASE62_ALPHABET) for _ in range(length)])
+
+
 def generate_unique_instance_id(
     prefix: str,
     session: Optional[Session] = None,
@@ -33,8 +40,7 @@ def generate_unique_instance_id(
 
     attempts = 0
     while attempts < max_attempts:
-        suffix = "".join(secrets.choice(BASE62_ALPHABET) for _ in range(length))
-        candidate = f"{prefix}-{suffix}"[:255]
+        candidate = f"{prefix}-{_random_suffix(length)}"[:255]
 
         if session is not None and ownership_cls is not None and select_stmt is not None:
             collision = False
@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
+from functools import lru_cache
 import hashlib
 from typing import Callable, Dict, Optional
 
@@ -168,15 +169,23 @@ class AlgorithmRegistry:
         return dict(self._algorithms)
 
 
-def _sha256_hexdigest(value: str) -> str:
-    """Return the SHA-256 hex digest of ``value`` encoded as ASCII."""
+_SHA256_MAX = (1 << 256) - 1
+
+
+@lru_cache(maxsize=1024)
+def _sha256_int(value: str) -> int:
+    """Return the SHA-256 digest of ``value`` (ASCII) as a 256-bit integer.
+
+    Results are memoized because a batch draw hashes the same winning number
+    once per evaluated instance.
+    """
     try:
         payload = value.encode("ascii")
     except UnicodeEncodeError as exc:
         raise ValueError(
             "draw and winning numbers must contain only ASCII characters"
         ) from exc
-    return hashlib.sha256(payload).hexdigest()
+    return int.from_bytes(hashlib.sha256(payload).digest(), "big")
 
 
 def _extract_top_digits(value: int, *, digits: int = 10) -> str:
@@ -190,27 +199,11 @@ def _extract_top_digits(value: int, *, digits: int = 10) -> str:
 
 def _sha256_hex_similarity(draw_number: str, winning_number: str) -> ScoreComputation:
     """Score similarity by SHA-256 hashing and measuring hex proximity."""
-    hashed_left = _sha256_hexdigest(draw_number)
-    hashed_right = _sha256_hexdigest(winning_number)
-
-    if len(hashed_left) != len(hashed_right):
-        raise ValueError("hashed draw and winning numbers must be the same length")
-
-    left_int = int(hashed_left, 16)
-    right_int = int(hashed_right, 16)
+    left_int = _sha256_int(draw_number)
+    right_int = _sha256_int(winning_number)
     diff = abs(left_int - right_int)
 
-    max_value = (1 << (len(hashed_left) * 4)) - 1
-    if max_value <= 0:
-        draw_top_digits = _extract_top_digits(left_int)
-        winning_top_digits = _extract_top_digits(right_int)
-        return ScoreComputation(
-            score=1.0,
-            draw_top_digits=draw_top_digits,
-            winning_top_digits=winning_top_digits,
-        )
-
-    similarity = (0.6 - (diff / max_value)) * 1.5
+    similarity = (0.6 - (diff / _SHA256_MAX)) * 1.5
     if similarity < 0.0:
         similarity = 0.0
     if similarity > 1.0:
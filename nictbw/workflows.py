@@ -1,8 +1,9 @@
 from typing import TYPE_CHECKING, Iterable, Optional, Sequence
 from datetime import datetime, timezone
+import heapq
 
 from sqlalchemy import select
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, selectinload
 
 from .models import PrizeDrawResult, PrizeDrawType, PrizeDrawWinningNumber
 from .models.nft import NFTDefinition
@@ -278,9 +279,13 @@ def _unique_instances_preserve_insertion(
 def _instances_in_completed_bingo_lines(session: Session) -> list["NFTInstance"]:
     """Return NFT instances that belong to any completed bingo line."""
 
-    from .models.bingo import BingoCard
+    from .models.bingo import BingoCard, BingoCell
 
-    cards = session.scalars(select(BingoCard)).all()
+    cards = session.scalars(
+        select(BingoCard).options(
+            selectinload(BingoCard.cells).selectinload(BingoCell.matched_nft_instance)
+        )
+    ).all()
     eligible: list[NFTInstance] = []
     for card in cards:
         completed_lines = card.completed_lines
@@ -309,6 +314,16 @@ def _instances_for_definition(
     return _unique_instances_preserve_insertion(session.scalars(stmt).all())
 
 
+def _prize_draw_rank_key(res: PrizeDrawResult) -> tuple[float, datetime, int]:
+    """Sort key ranking higher similarity first, then earlier evaluation."""
+
+    return (
+        -float(res.similarity_score or 0.0),
+        res.evaluated_at or datetime.min.replace(tzinfo=timezone.utc),
+        res.id or 0,
+    )
+
+
 def _rank_prize_draw_results_with_ties(
     results: Sequence[PrizeDrawResult],
     *,
@@ -328,36 +343,28 @@ def _rank_prize_draw_results_with_ties(
             )
         normalized.append(res)
 
-    sorted_results = sorted(
-        normalized,
-        key=lambda res: (
-            -float(res.similarity_score or 0.0),
-            res.evaluated_at or datetime.min.replace(tzinfo=timezone.utc),
-            res.id or 0,
-        ),
-    )
-
     if limit is None:
-        return sorted_results
+        return sorted(normalized, key=_prize_draw_rank_key)
     if limit == 0:
         return []
 
-    winners: list[PrizeDrawResult] = []
-    cutoff_score: Optional[float] = None
-    for res in sorted_results:
-        score = res.similarity_score
-        if score is None:
-            continue
-        if not winners or len(winners) < limit:
-            winners.append(res)
-            cutoff_score = score
-            continue
-        if cutoff_score is not None and score == cutoff_score:
-            winners.append(res)
-            continue
-        break
-
-    return winners
+    # Only the top ``limit`` entries need ordering; ties at the cutoff are
+    # collected in a second linear pass.
+    winners = heapq.nsmallest(limit, normalized, key=_prize_draw_rank_key)
+    if len(winners) < limit:
+        return winners
+
+    cutoff_score = winners[-1].similarity_score
+    selected = {id(res) for res in winners}
+    ties = sorted(
+        (
+            res
+            for res in normalized
+            if id(res) not in selected and res.similarity_score == cutoff_score
+        ),
+        key=_prize_draw_rank_key,
+    )
+    return winners + ties
 
 
 def run_prize_draw_batch(
@@ -420,20 +427,16 @@ def run_prize_draw_batch(
         if not instances_to_evaluate:
             return []
 
-    results: list[PrizeDrawResult] = []
-    for instance in instances_to_evaluate:
-        result = run_prize_draw(
-            session=session,
-            nft_instance=instance,
-            draw_type=draw_type,
-            winning_number=resolved_winning_number,
-            threshold=threshold,
-            registry=registry,
-        )
-        results.append(result)
+    engine = PrizeDrawEngine(session, registry=registry)
+    evaluations = engine.evaluate_batch(
+        instances=instances_to_evaluate,
+        draw_type=draw_type,
+        winning_number=resolved_winning_number,
+        threshold=threshold,
+    )
 
     session.flush()
-    return results
+    return [evaluation.result for evaluation in evaluations]
 
 
 def run_bingo_prize_draw(
@@ -0,0 +1,160 @@
+"""Shared in-memory SQLite fixture for database-backed test cases."""
+
+import sqlite3
+import unittest
+from contextlib import contextmanager
+from datetime import datetime, timezone
+
+from sqlalchemy import create_engine, event, insert
+from sqlalchemy.dialects import sqlite
+from sqlalchemy.orm import configure_mappers, sessionmaker
+from sqlalchemy.pool import StaticPool
+from sqlalchemy.schema import CreateIndex, CreateTable
+
+from nictbw.models import Admin, Base, User
+
+# Fixed timestamp for fixture rows whose exact time is never asserted on.
+NOW = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+# Durability is irrelevant for throwaway in-memory test databases.
+_SQLITE_PRAGMAS = (
+    "PRAGMA synchronous=OFF",
+    "PRAGMA journal_mode=MEMORY",
+    "PRAGMA locking_mode=EXCLUSIVE",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-20000",
+)
+
+
+def _compile_schema_script() -> str:
+    """Compile the full model DDL for SQLite into one executable script."""
+
+    dialect = sqlite.dialect()
+    statements = []
+    # SQLite resolves foreign-key targets lazily, so table order is irrelevant
+    # (and ``sorted_tables`` warns about the prize-draw/raffle cycle).
+    for table in Base.metadata.tables.values():
+        statements.append(str(CreateTable(table).compile(dialect=dialect)).strip())
+        statements.extend(
+            str(CreateIndex(index).compile(dialect=dialect)).strip()
+            for index in sorted(table.indexes, key=lambda index: index.name or "")
+        )
+    return ";\n".join(statements) + ";\n"
+
+
+def _build_template_image() -> bytes:
+    """Create the schema once and return the serialized empty database."""
+
+    connection = sqlite3.connect(":memory:")
+    try:
+        connection.executescript(_compile_schema_script())
+        return connection.serialize()
+    finally:
+        connection.close()
+
+
+def seed_admin_and_user(
+    session, *, email: str, in_app_id: str, paymail: str
+) -> tuple[int, int]:
+    """Insert one admin and one user and return their ``(admin_id, user_id)``."""
+
+    admin_id = session.execute(
+        insert(Admin).values(email=email, password_hash="x").returning(Admin.id)
+    ).scalar_one()
+    user_id = session.execute(
+        insert(User)
+        .values(in_app_id=in_app_id, paymail=paymail)
+        .returning(User.id)
+    ).scalar_one()
+    return admin_id, user_id
+
+
+# Resolve relationships for every model up front rather than inside
+# whichever test happens to instantiate a mapped class first.
+configure_mappers()
+_TEMPLATE_IMAGE = _build_template_image()
+
+
+class SqliteInMemoryTestCase(unittest.TestCase):
+    """Test case base class backed by an isolated in-memory database.
+
+    Each class gets its own copy of the template schema. Each test runs inside
+    a connection-level transaction that is rolled back in ``tearDown``;
+    sessions from ``self.Session`` join it through SAVEPOINTs, so tests may
+    ``commit()`` freely. Override ``seed_fixtures`` for rows every test in the
+    class needs.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        database = sqlite3.connect(":memory:", check_same_thread=False)
+        database.deserialize(_TEMPLATE_IMAGE)
+        cls.engine = create_engine(
+            "sqlite+pysqlite://",
+            creator=lambda: database,
+            poolclass=StaticPool,
+            future=True,
+        )
+
+        @event.listens_for(cls.engine, "connect")
+        def _configure_connection(dbapi_connection, _connection_record):
+            # pysqlite's own transaction handling breaks SAVEPOINT; let
+            # SQLAlchemy emit BEGIN itself.
+            dbapi_connection.isolation_level = None
+            cursor = dbapi_connection.cursor()
+            for pragma in _SQLITE_PRAGMAS:
+                cursor.execute(pragma)
+            cursor.close()
+
+        @event.listens_for(cls.engine, "begin")
+        def _emit_begin(conn):
+            conn.exec_driver_sql("BEGIN")
+
+        cls.connection = cls.engine.connect()
+        cls.Session = sessionmaker(
+            bind=cls.connection,
+            join_transaction_mode="create_savepoint",
+            future=True,
+            expire_on_commit=False,
+        )
+        with cls.Session.begin() as session:
+            cls.seed_fixtures(session)
+
+    @classmethod
+    def seed_fixtures(cls, session):
+        """Insert rows shared by every test in the class.
+
+        Runs once in ``setUpClass`` and is committed, so the rows survive the
+        per-test rollbacks. Store primary keys on ``cls`` rather than ORM
+        objects and re-fetch them with ``session.get`` inside each test.
+        """
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.connection.close()
+        cls.engine.dispose()
+        super().tearDownClass()
+
+    @contextmanager
+    def count_queries(self):
+        """Collect every SQL statement the class engine executes in the block."""
+
+        statements = []
+
+        def _record(_conn, _cursor, statement, _parameters, _context, _executemany):
+            statements.append(statement)
+
+        event.listen(self.engine, "before_cursor_execute", _record)
+        try:
+            yield statements
+        finally:
+            event.remove(self.engine, "before_cursor_execute", _record)
+
+    def setUp(self):
+        super().setUp()
+        self.transaction = self.connection.begin()
+
+    def tearDown(self):
+        self.transaction.rollback()
+        super().tearDown()
@@ -3,21 +3,16 @@ import random
 import unittest
 import warnings
 from datetime import datetime, timezone
-from typing import TYPE_CHECKING, cast
 
-from sqlalchemy import create_engine, select
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy import insert, select
+from sqlalchemy.orm import raiseload, selectinload
 
 from sqlalchemy.exc import IntegrityError
 from unittest.mock import patch
 
-if TYPE_CHECKING:
-    from nictbw.blockchain.api import ChainClient
-else:
-    ChainClient = object
+from tests.db_fixture import NOW, SqliteInMemoryTestCase
 
 from nictbw.models import (
-    Base,
     User,
     Admin,
     NFTCondition,
@@ -41,6 +36,34 @@ from nictbw.models import (
 )
 
 
+def _make_admin(email: str = "admin@example.com") -> Admin:
+    """Return a transient admin; only the NOT NULL columns are filled in."""
+    return Admin(email=email, password_hash="x")
+
+
+def _bulk_definitions(session, admin: Admin, prefixes) -> list[NFTDefinition]:
+    """Insert plain definitions for ``prefixes`` in one INSERT ... RETURNING."""
+    return list(
+        session.scalars(
+            insert(NFTDefinition).returning(NFTDefinition, sort_by_parameter_order=True),
+            [
+                {
+                    "prefix": prefix,
+                    "shared_key": f"shared-{prefix.lower()}",
+                    "name": prefix,
+                    "nft_type": "default",
+                    "category": "cat",
+                    "subcategory": f"s{prefix.lower()}",
+                    "created_by_admin_id": admin.id,
+                    "created_at": NOW,
+                    "updated_at": NOW,
+                }
+                for prefix in prefixes
+            ],
+        )
+    )
+
+
 class DummyChainClient:
     def __init__(self, items: list[dict]):
         self._items = items
@@ -51,23 +74,12 @@ class DummyChainClient:
         return self._items
 
 
-class DBTestCase(unittest.TestCase):
-    def setUp(self):
-        # In-memory SQLite for isolation
-        self.engine = create_engine("sqlite+pysqlite:///:memory:", future=True)
-        Base.metadata.create_all(self.engine)
-        self.Session = sessionmaker(
-            bind=self.engine, future=True, expire_on_commit=False
-        )
-
-    def tearDown(self):
-        self.engine.dispose()
-
+class DBTestCase(SqliteInMemoryTestCase):
     def test_admin_get_by_email(self):
-        with self.Session() as session:
-            admin = Admin(email="admin@example.com", password_hash="x")
+        with self.Session.begin() as session:
+            admin = _make_admin()
             session.add(admin)
-            session.commit()
+            session.flush()
 
             found = Admin.get_by_email(session, "admin@example.com")
             self.assertIsNotNone(found)
@@ -76,14 +88,14 @@ class DBTestCase(unittest.TestCase):
             self.assertEqual(found.email, "admin@example.com")
 
     def test_user_get_by_login_mail(self):
-        with self.Session() as session:
+        with self.Session.begin() as session:
             user = User(
                 in_app_id="user-login",
                 paymail="wallet-login",
                 email="user@example.com",
             )
             session.add(user)
-            session.commit()
+            session.flush()
 
             found = User.get_by_login_mail(session, "user@example.com")
             self.assertIsNotNone(found)
@@ -91,7 +103,7 @@ class DBTestCase(unittest.TestCase):
             self.assertEqual(found.email, "user@example.com")
 
     def test_user_login_mail_optional(self):
-        with self.Session() as session:
+        with self.Session.begin() as session:
             user_one = User(in_app_id="user-one", paymail="wallet-one")
             user_two = User(
                 in_app_id="user-two",
@@ -99,50 +111,46 @@ class DBTestCase(unittest.TestCase):
                 email=None,
             )
             session.add_all([user_one, user_two])
-            session.commit()
+            session.flush()
 
-            refreshed = session.get(User, user_one.id)
-            assert refreshed is not None
-            self.assertIsNone(refreshed.login_mail)
+            self.assertIsNone(user_one.login_mail)
 
     def test_nft_count_and_get_by_prefix(self):
-        now = datetime.now(timezone.utc)
-        with self.Session() as session:
-            admin = Admin(email="a@b.com", password_hash="x")
+        with self.Session.begin() as session:
+            admin = _make_admin("a@b.com")
             session.add(admin)
             session.flush()
 
-            nft_p = NFTDefinition(
-                prefix="P",
-                shared_key="shared-p",
-                name="NFTDefinition-P",
-                nft_type="default",
-                category="cat",
-                subcategory="subp",
-                created_by_admin_id=admin.id,
-                created_at=now,
-                updated_at=now,
-            )
-            nft_q = NFTDefinition(
-                prefix="Q",
-                shared_key="shared-q",
-                name="NFTDefinition-Q",
-                nft_type="default",
-                category="cat",
-                subcategory="subq",
-                created_by_admin_id=admin.id,
-                created_at=now,
-                updated_at=now,
-            )
-            user_one = User(in_app_id="u1", paymail="wallet1")
-            user_two = User(in_app_id="u2", paymail="wallet2")
-            session.add_all([nft_p, nft_q, user_one, user_two])
-            session.flush()
+            nft_p, nft_q = session.scalars(
+                insert(NFTDefinition).returning(
+                    NFTDefinition, sort_by_parameter_order=True
+                ),
+                [
+                    {
+                        "prefix": prefix,
+                        "shared_key": f"shared-{prefix.lower()}",
+                        "name": f"NFTDefinition-{prefix}",
+                        "nft_type": "default",
+                        "category": "cat",
+                        "subcategory": f"sub{prefix.lower()}",
+                        "created_by_admin_id": admin.id,
+                        "created_at": NOW,
+                        "updated_at": NOW,
+                    }
+                    for prefix in ("P", "Q")
+                ],
+            ).all()
+            user_one, user_two = session.scalars(
+                insert(User).returning(User, sort_by_parameter_order=True),
+                [
+                    {"in_app_id": "u1", "paymail": "wallet1"},
+                    {"in_app_id": "u2", "paymail": "wallet2"},
+                ],
+            ).all()
 
             nft_p.issue_dbwise_to_user(session, user_one)
             nft_p.issue_dbwise_to_user(session, user_two)
             nft_q.issue_dbwise_to_user(session, user_one)
-            session.commit()
 
             count_p = NFTDefinition.count_instances_by_prefix(session, "P")
             self.assertEqual(count_p, 2)
@@ -154,18 +162,16 @@ class DBTestCase(unittest.TestCase):
             self.assertEqual(refreshed.minted_count, 2)
 
     def test_nft_condition_definition_constraint_fields(self):
-        with self.Session() as session:
+        with self.Session.begin() as session:
             cond = NFTCondition(
                 required_definition_id=101,
                 prohibited_definition_id=202,
             )
             session.add(cond)
-            session.commit()
+            session.flush()
 
-            reloaded = session.get(NFTCondition, cond.id)
-            assert reloaded is not None
-            self.assertEqual(reloaded.required_definition_id, 101)
-            self.assertEqual(reloaded.prohibited_definition_id, 202)
+            self.assertEqual(cond.required_definition_id, 101)
+            self.assertEqual(cond.prohibited_definition_id, 202)
 
             with self.assertRaises(TypeError):
                 NFTCondition(required_nft_id=1)
@@ -173,9 +179,8 @@ class DBTestCase(unittest.TestCase):
                 NFTCondition(prohibited_nft_id=2)
 
     def test_user_issue_nft_creates_ownership_and_increments(self):
-        now = datetime.now(timezone.utc)
-        with self.Session() as session:
-            admin = Admin(email="owner@admin.com", password_hash="x")
+        with self.Session.begin() as session:
+            admin = _make_admin("owner@admin.com")
             session.add(admin)
             session.flush()
 
@@ -187,8 +192,8 @@ class DBTestCase(unittest.TestCase):
                 category="cat",
                 subcategory="sub",
                 created_by_admin_id=admin.id,
-                created_at=now,
-                updated_at=now,
+                created_at=NOW,
+                updated_at=NOW,
             )
             user = User(in_app_id="u1", paymail="wallet1")
             user_two = User(in_app_id="u2", paymail="wallet2")
@@ -215,35 +220,28 @@ class DBTestCase(unittest.TestCase):
                 second_instance = nft.issue_dbwise_to_user(
                     session, user, acquired_at=nft.created_at
                 )
-            session.commit()
 
             # Verify minted_count incremented for both issues
             self.assertEqual(nft.minted_count, 2)
             # Two instances are created for the same user+definition
             self.assertEqual(len(user.nft_instances), 2)
 
-            first = session.get(NFTInstance, first_instance.id)
-            second = session.get(NFTInstance, second_instance.id)
-            assert first is not None
-            assert second is not None
-
-            self.assertEqual(first.user_id, user.id)
-            self.assertEqual(second.user_id, user.id)
-            self.assertEqual(first.definition_id, nft.id)
-            self.assertEqual(second.definition_id, nft.id)
-            self.assertEqual(first.serial_number, 0)
-            self.assertEqual(second.serial_number, 1)
-            self.assertEqual(first.unique_instance_id, "ABC-1234567890ab")
-            self.assertEqual(second.unique_instance_id, "ABC-1234567890ac")
-            self.assertEqual(first.acquired_at, nft.created_at)
-            self.assertEqual(second.acquired_at, nft.created_at)
+            self.assertEqual(first_instance.user_id, user.id)
+            self.assertEqual(second_instance.user_id, user.id)
+            self.assertEqual(first_instance.definition_id, nft.id)
+            self.assertEqual(second_instance.definition_id, nft.id)
+            self.assertEqual(first_instance.serial_number, 0)
+            self.assertEqual(second_instance.serial_number, 1)
+            self.assertEqual(first_instance.unique_instance_id, "ABC-1234567890ab")
+            self.assertEqual(second_instance.unique_instance_id, "ABC-1234567890ac")
+            self.assertEqual(first_instance.acquired_at, nft.created_at)
+            self.assertEqual(second_instance.acquired_at, nft.created_at)
 
     def test_user_nft_instances_returns_instances(self):
-        now = datetime.now(timezone.utc)
-        with self.Session() as session:
+        with self.Session.begin() as session:
             self.assertFalse(hasattr(User, "nfts"))
 
-            admin = Admin(email="nfts-admin@example.com", password_hash="x")
+            admin = _make_admin("nfts-admin@example.com")
             user = User(in_app_id="u-nfts", paymail="wallet-nfts")
             session.add_all([admin, user])
             session.flush()
@@ -254,25 +252,23 @@ class DBTestCase(unittest.TestCase):
                 name="User NFT",
                 nft_type="default",
                 created_by_admin_id=admin.id,
-                created_at=now,
-                updated_at=now,
+                created_at=NOW,
+                updated_at=NOW,
             )
             session.add(nft)
             session.flush()
 
             ownership = nft.issue_dbwise_to_user(session, user, nft_origin="origin-user")
-            session.flush()
 
             self.assertEqual(len(user.nft_instances), 1)
             self.assertIsInstance(user.nft_instances[0], NFTInstance)
             self.assertEqual(user.nft_instances[0].id, ownership.id)
 
     def test_template_instantiate_instance_creates_instance(self):
-        now = datetime.now(timezone.utc)
-        with self.Session() as session:
+        with self.Session.begin() as session:
             self.assertFalse(hasattr(NFTTemplate, "instantiate_nft"))
 
-            admin = Admin(email="template-admin@example.com", password_hash="x")
+            admin = _make_admin("template-admin@example.com")
             user = User(in_app_id="tpl-user", paymail="tpl-wallet")
             session.add_all([admin, user])
             session.flush()
@@ -284,8 +280,8 @@ class DBTestCase(unittest.TestCase):
                 subcategory="shop",
                 description="template desc",
                 created_by_admin_id=admin.id,
-                created_at=now,
-                updated_at=now,
+                created_at=NOW,
+                updated_at=NOW,
             )
             session.add(template)
             session.flush()
@@ -294,7 +290,7 @@ class DBTestCase(unittest.TestCase):
                 session,
                 user,
                 shared_key="tpl-shared",
-                acquired_at=now,
+                acquired_at=NOW,
                 nft_origin="tpl-origin",
             )
             session.flush()
@@ -306,9 +302,8 @@ class DBTestCase(unittest.TestCase):
             self.assertEqual(instance.nft_origin, "tpl-origin")
 
     def test_template_definition_constraint_fields(self):
-        now = datetime.now(timezone.utc)
-        with self.Session() as session:
-            admin = Admin(email="template-constraint-admin@example.com", password_hash="x")
+        with self.Session.begin() as session:
+            admin = _make_admin("template-constraint-admin@example.com")
             session.add(admin)
             session.flush()
 
@@ -318,16 +313,14 @@ class DBTestCase(unittest.TestCase):
                 required_definition_id=303,
                 prohibited_definition_id=404,
                 created_by_admin_id=admin.id,
-                created_at=now,
-                updated_at=now,
+                created_at=NOW,
+                updated_at=NOW,
             )
             session.add(template)
-            session.commit()
+            session.flush()
 
-            reloaded = session.get(NFTTemplate, template.id)
-            assert reloaded is not None
-            self.assertEqual(reloaded.required_definition_id, 303)
-            self.assertEqual(reloaded.prohibited_definition_id, 404)
+            self.assertEqual(template.required_definition_id, 303)
+            self.assertEqual(template.prohibited_definition_id, 404)
 
             with self.assertRaises(TypeError):
                 NFTTemplate(
@@ -335,8 +328,8 @@ class DBTestCase(unittest.TestCase):
                     name="Legacy Required",
                     required_nft_id=1,
                     created_by_admin_id=admin.id,
-                    created_at=now,
-                    updated_at=now,
+                    created_at=NOW,
+                    updated_at=NOW,
                 )
             with self.assertRaises(TypeError):
                 NFTTemplate(
@@ -344,12 +337,12 @@ class DBTestCase(unittest.TestCase):
                     name="Legacy Prohibited",
                     prohibited_nft_id=2,
                     created_by_admin_id=admin.id,
-                    created_at=now,
-                    updated_at=now,
+                    created_at=NOW,
+                    updated_at=NOW,
                 )
 
     def test_coupon_template_redeemed_count_and_max_redeem(self):
-        with self.Session() as session:
+        with self.Session.begin() as session:
             template = CouponTemplate(
                 prefix="CPN1",
                 name="Spring Discount",
@@ -371,18 +364,15 @@ class DBTestCase(unittest.TestCase):
                 coupon_code="CPN1-2",
             )
             session.add_all([coupon1, coupon2])
-            session.commit()
+            session.flush()
 
-            reloaded = session.get(CouponTemplate, template.id)
-            assert reloaded is not None
-            self.assertEqual(reloaded.max_redeem, 3)
-            self.assertEqual(reloaded.redeemed_count, 1)
-            self.assertEqual(reloaded.remaining_redeem, 2)
+            self.assertEqual(template.max_redeem, 3)
+            self.assertEqual(template.redeemed_count, 1)
+            self.assertEqual(template.remaining_redeem, 2)
 
     def test_coupon_binding_definition_method_renames(self):
-        now = datetime.now(timezone.utc)
-        with self.Session() as session:
-            admin = Admin(email="binding-admin@example.com", password_hash="x")
+        with self.Session.begin() as session:
+            admin = _make_admin("binding-admin@example.com")
             session.add(admin)
             session.flush()
 
@@ -392,8 +382,8 @@ class DBTestCase(unittest.TestCase):
                 name="Binding Definition",
                 nft_type="default",
                 created_by_admin_id=admin.id,
-                created_at=now,
-                updated_at=now,
+                created_at=NOW,
+                updated_at=NOW,
             )
             template = CouponTemplate(prefix="BIND-TPL")
             session.add_all([definition, template])
@@ -410,7 +400,7 @@ class DBTestCase(unittest.TestCase):
                 active=False,
             )
             session.add_all([active_binding, inactive_binding])
-            session.commit()
+            session.flush()
 
             active_bindings = NFTCouponBinding.get_active_for_definition(
                 session, definition.id
@@ -429,9 +419,8 @@ class DBTestCase(unittest.TestCase):
             self.assertFalse(hasattr(NFTCouponBinding, "get_binding"))
 
     def test_coupon_template_default_display_definition_id(self):
-        now = datetime.now(timezone.utc)
-        with self.Session() as session:
-            admin = Admin(email="coupon-admin@example.com", password_hash="x")
+        with self.Session.begin() as session:
+            admin = _make_admin("coupon-admin@example.com")
             session.add(admin)
             session.flush()
 
@@ -441,8 +430,8 @@ class DBTestCase(unittest.TestCase):
                 name="Coupon Display",
                 nft_type="default",
                 created_by_admin_id=admin.id,
-                created_at=now,
-                updated_at=now,
+                created_at=NOW,
+                updated_at=NOW,
             )
             session.add(definition)
             session.flush()
@@ -452,19 +441,16 @@ class DBTestCase(unittest.TestCase):
                 default_display_definition_id=definition.id,
             )
             session.add(template)
-            session.commit()
+            session.flush()
 
-            reloaded = session.get(CouponTemplate, template.id)
-            assert reloaded is not None
-            self.assertEqual(reloaded.default_display_definition_id, definition.id)
+            self.assertEqual(template.default_display_definition_id, definition.id)
 
             with self.assertRaises(TypeError):
                 CouponTemplate(prefix="CPN-OLD", default_display_nft_id=definition.id)
 
     def test_coupon_store_definition_fields(self):
-        now = datetime.now(timezone.utc)
-        with self.Session() as session:
-            admin = Admin(email="coupon-store-admin@example.com", password_hash="x")
+        with self.Session.begin() as session:
+            admin = _make_admin("coupon-store-admin@example.com")
             session.add(admin)
             session.flush()
 
@@ -474,8 +460,8 @@ class DBTestCase(unittest.TestCase):
                 name="Coupon Store",
                 nft_type="default",
                 created_by_admin_id=admin.id,
-                created_at=now,
-                updated_at=now,
+                created_at=NOW,
+                updated_at=NOW,
             )
             session.add(definition)
             session.flush()
@@ -486,20 +472,17 @@ class DBTestCase(unittest.TestCase):
                 definition_id=definition.id,
             )
             session.add(store)
-            session.commit()
+            session.flush()
 
-            reloaded = session.get(CouponStore, store.id)
-            assert reloaded is not None
-            self.assertEqual(reloaded.definition_id, definition.id)
-            self.assertEqual(reloaded.definition.id, definition.id)
+            self.assertEqual(store.definition_id, definition.id)
+            self.assertEqual(store.definition.id, definition.id)
 
             with self.assertRaises(TypeError):
                 CouponStore(name="legacy-store", store_name="Legacy Store", nft_id=definition.id)
 
     def test_nft_claim_request_definition_fields(self):
-        now = datetime.now(timezone.utc)
-        with self.Session() as session:
-            admin = Admin(email="claim-admin@example.com", password_hash="x")
+        with self.Session.begin() as session:
+            admin = _make_admin("claim-admin@example.com")
             user = User(in_app_id="claim-user", paymail="claim-wallet")
             session.add_all([admin, user])
             session.flush()
@@ -510,8 +493,8 @@ class DBTestCase(unittest.TestCase):
                 name="Claim Definition",
                 nft_type="default",
                 created_by_admin_id=admin.id,
-                created_at=now,
-                updated_at=now,
+                created_at=NOW,
+                updated_at=NOW,
             )
             session.add(definition)
             session.flush()
@@ -524,12 +507,10 @@ class DBTestCase(unittest.TestCase):
                 shared_key=definition.shared_key,
             )
             session.add(claim)
-            session.commit()
+            session.flush()
 
-            reloaded = session.get(NFTClaimRequest, claim.id)
-            assert reloaded is not None
-            self.assertEqual(reloaded.definition_id, definition.id)
-            self.assertEqual(reloaded.definition.id, definition.id)
+            self.assertEqual(claim.definition_id, definition.id)
+            self.assertEqual(claim.definition.id, definition.id)
 
             with self.assertRaises(TypeError):
                 NFTClaimRequest(
@@ -541,14 +522,10 @@ class DBTestCase(unittest.TestCase):
                 )
 
     def test_generate_unique_instance_id_retries_on_collision(self):
-        now = datetime.now(timezone.utc)
-        with self.Session() as session:
-            admin = Admin(email="collision@admin.com", password_hash="x")
-            session.add(admin)
-            session.flush()
-
+        with self.Session.begin() as session:
+            admin = _make_admin("collision@admin.com")
             user = User(in_app_id="collision-user", paymail="collision-wallet")
-            session.add(user)
+            session.add_all([admin, user])
             session.flush()
 
             nft = NFTDefinition(
@@ -557,8 +534,8 @@ class DBTestCase(unittest.TestCase):
                 name="Collision",
                 nft_type="default",
                 created_by_admin_id=admin.id,
-                created_at=now,
-                updated_at=now,
+                created_at=NOW,
+                updated_at=NOW,
             )
             session.add(nft)
             session.flush()
@@ -568,7 +545,7 @@ class DBTestCase(unittest.TestCase):
                 definition_id=nft.id,
                 serial_number=0,
                 unique_instance_id="COL-AAAAAAAAAAAA",
-                acquired_at=now,
+                acquired_at=NOW,
             )
             session.add(ownership)
             session.flush()
@@ -578,8 +555,8 @@ class DBTestCase(unittest.TestCase):
             self.assertFalse(hasattr(model_utils, "generate_unique_nft_id"))
 
             with patch(
-                "nictbw.models.utils.secrets.choice",
-                side_effect=list("A" * 12 + "B" * 12),
+                "nictbw.models.utils._random_suffix",
+                side_effect=["A" * 12, "B" * 12],
             ):
                 generated = model_utils.generate_unique_instance_id("COL", session=session)
 
@@ -591,13 +568,12 @@ class DBTestCase(unittest.TestCase):
                     definition_id=nft.id,
                     serial_number=1,
                     unique_nft_id="COL-CCCCCCCCCCCC",
-                    acquired_at=now,
+                    acquired_at=NOW,
                 )
 
     def test_template_max_supply_enforced(self):
-        now = datetime.now(timezone.utc)
-        with self.Session() as session:
-            admin = Admin(email="admin@max.com", password_hash="x")
+        with self.Session.begin() as session:
+            admin = _make_admin("admin@max.com")
             session.add(admin)
             session.flush()
 
@@ -610,8 +586,8 @@ class DBTestCase(unittest.TestCase):
                 subcategory="sub",
                 max_supply=1,
                 created_by_admin_id=admin.id,
-                created_at=now,
-                updated_at=now,
+                created_at=NOW,
+                updated_at=NOW,
             )
             user = User(in_app_id="u1", paymail="wallet1")
             user_two = User(in_app_id="u2", paymail="wallet2")
@@ -624,9 +600,8 @@ class DBTestCase(unittest.TestCase):
                 nft.issue_dbwise_to_user(session, user_two)
 
     def test_bingo_period_reward_definition_fields(self):
-        now = datetime.now(timezone.utc)
-        with self.Session() as session:
-            admin = Admin(email="period-admin@example.com", password_hash="x")
+        with self.Session.begin() as session:
+            admin = _make_admin("period-admin@example.com")
             session.add(admin)
             session.flush()
 
@@ -636,13 +611,13 @@ class DBTestCase(unittest.TestCase):
                 name="Bingo Reward Definition",
                 nft_type="default",
                 created_by_admin_id=admin.id,
-                created_at=now,
-                updated_at=now,
+                created_at=NOW,
+                updated_at=NOW,
             )
             period = BingoPeriod(
                 name="Period 1",
-                start_time=now,
-                end_time=now,
+                start_time=NOW,
+                end_time=NOW,
             )
             session.add_all([definition, period])
             session.flush()
@@ -652,20 +627,17 @@ class DBTestCase(unittest.TestCase):
                 reward_definition_id=definition.id,
             )
             session.add(reward)
-            session.commit()
+            session.flush()
 
-            reloaded = session.get(BingoPeriodReward, reward.id)
-            assert reloaded is not None
-            self.assertEqual(reloaded.reward_definition_id, definition.id)
-            self.assertEqual(reloaded.reward_definition.id, definition.id)
+            self.assertEqual(reward.reward_definition_id, definition.id)
+            self.assertEqual(reward.reward_definition.id, definition.id)
 
             with self.assertRaises(TypeError):
                 BingoPeriodReward(period_id=period.id, reward_nft_id=definition.id)
 
     def test_bingo_card_issue_task_unique_instance_ref(self):
-        now = datetime.now(timezone.utc)
-        with self.Session() as session:
-            admin = Admin(email="issue-task-admin@example.com", password_hash="x")
+        with self.Session.begin() as session:
+            admin = _make_admin("issue-task-admin@example.com")
             user = User(in_app_id="issue-task-user", paymail="issue-task-wallet")
             session.add_all([admin, user])
             session.flush()
@@ -676,8 +648,8 @@ class DBTestCase(unittest.TestCase):
                 name="Issue Task Definition",
                 nft_type="default",
                 created_by_admin_id=admin.id,
-                created_at=now,
-                updated_at=now,
+                created_at=NOW,
+                updated_at=NOW,
             )
             session.add(definition)
             session.flush()
@@ -687,7 +659,7 @@ class DBTestCase(unittest.TestCase):
                 definition_id=definition.id,
                 serial_number=0,
                 unique_instance_id="ISSUE-TASK-AAAAAAAAAAAA",
-                acquired_at=now,
+                acquired_at=NOW,
             )
             session.add(ownership)
             session.flush()
@@ -699,11 +671,9 @@ class DBTestCase(unittest.TestCase):
                 unique_instance_ref=ownership.unique_instance_id,
             )
             session.add(task)
-            session.commit()
+            session.flush()
 
-            reloaded = session.get(BingoCardIssueTask, task.id)
-            assert reloaded is not None
-            self.assertEqual(reloaded.unique_instance_ref, ownership.unique_instance_id)
+            self.assertEqual(task.unique_instance_ref, ownership.unique_instance_id)
 
             with self.assertRaises(TypeError):
                 BingoCardIssueTask(
@@ -722,16 +692,17 @@ class DBTestCase(unittest.TestCase):
             self.assertFalse(hasattr(BingoCardIssueTask, "ownership_id"))
 
     def test_bingo_completed_lines(self):
-        card = BingoCard(user_id=1, issued_at=datetime.now(timezone.utc))
+        card = BingoCard(user_id=1, issued_at=NOW)
         # Prepare 9 cells, initially locked
-        for i in range(9):
-            cell = BingoCell(
+        card.cells.extend(
+            BingoCell(
                 bingo_card_id=1,
                 idx=i,
                 target_definition_id=1,
                 state="locked",
             )
-            card.cells.append(cell)
+            for i in range(9)
+        )
 
         # Unlock first row
         card.cells[0].state = "unlocked"
@@ -742,6 +713,9 @@ class DBTestCase(unittest.TestCase):
         card.cells[4].state = "unlocked"
         card.cells[8].state = "unlocked"
 
+        # Bit ``idx`` is set for each unlocked cell: 0, 1, 2, 4 and 8
+        self.assertEqual(card.unlocked_mask, 0b100010111)
+
         lines = card.completed_lines
         self.assertIn((0, 1, 2), lines)
         self.assertIn((0, 4, 8), lines)
@@ -749,75 +723,60 @@ class DBTestCase(unittest.TestCase):
         self.assertNotIn((0, 3, 6), lines)
 
     def test_issue_nft_unlocks_bingo_cells_and_completes_card(self):
-        now = datetime.now(timezone.utc)
-        with self.Session() as session:
-            admin = Admin(email="admin@example.com", password_hash="x")
+        with self.Session.begin() as session:
+            admin = _make_admin()
             session.add(admin)
             session.flush()
 
-            prefixes = ["A", "B", "C", "X0", "X1", "X2", "X3", "X4", "X5"]
-            definitions = []
-            for prefix in prefixes:
-                definitions.append(
-                    NFTDefinition(
-                        prefix=prefix,
-                        shared_key=f"shared-{prefix}",
-                        name=prefix,
-                        nft_type="default",
-                        category="cat",
-                        subcategory=f"s{prefix.lower()}",
-                        created_by_admin_id=admin.id,
-                        created_at=now,
-                        updated_at=now,
-                    )
-                )
+            definitions = _bulk_definitions(
+                session, admin, ["A", "B", "C", "X0", "X1", "X2", "X3", "X4", "X5"]
+            )
             user = User(in_app_id="u1", paymail="wallet1")
-            session.add_all(definitions + [user])
+            session.add(user)
             session.flush()
 
-            card = BingoCard(user_id=user.id, issued_at=now)
+            card = BingoCard(user_id=user.id, issued_at=NOW)
             session.add(card)
             session.flush()
 
-            cells = [
-                BingoCell(bingo_card_id=card.id, idx=0, target_definition_id=definitions[0].id),
-                BingoCell(bingo_card_id=card.id, idx=1, target_definition_id=definitions[1].id),
-                BingoCell(bingo_card_id=card.id, idx=2, target_definition_id=definitions[2].id),
-            ]
-            for i in range(3, 9):
-                cells.append(
-                    BingoCell(
-                        bingo_card_id=card.id,
-                        idx=i,
-                        target_definition_id=definitions[i].id,
-                    )
-                )
-            for c in cells:
-                card.cells.append(c)
-                session.add(c)
-            session.flush()
+            session.execute(
+                insert(BingoCell),
+                [
+                    {
+                        "bingo_card_id": card.id,
+                        "idx": i,
+                        "target_definition_id": definitions[i].id,
+                    }
+                    for i in range(9)
+                ],
+            )
 
             definitions[0].issue_dbwise_to_user(session, user)
             definitions[1].issue_dbwise_to_user(session, user)
             definitions[2].issue_dbwise_to_user(session, user)
-            session.commit()
 
             self.assertEqual(card.state, "active")
             self.assertIsNone(card.completed_at)
 
             for i in range(3, 9):
                 definitions[i].issue_dbwise_to_user(session, user)
-            session.commit()
 
+            # Reload from the database with cells eagerly loaded; raiseload
+            # makes any other lazy load here fail instead of hiding an N+1.
+            card = session.scalars(
+                select(BingoCard)
+                .where(BingoCard.id == card.id)
+                .options(selectinload(BingoCard.cells), raiseload("*"))
+                .execution_options(populate_existing=True)
+            ).one()
             self.assertEqual(card.state, "completed")
             self.assertIsNotNone(card.completed_at)
             self.assertTrue(all(c.state == "unlocked" for c in card.cells))
             self.assertTrue(all(c.matched_nft_instance_id is not None for c in card.cells))
 
     def test_user_unlock_cells_for_definition(self):
-        now = datetime.now(timezone.utc)
-        with self.Session() as session:
-            admin = Admin(email="admin@example.com", password_hash="x")
+        with self.Session.begin() as session:
+            admin = _make_admin()
             session.add(admin)
             session.flush()
 
@@ -829,8 +788,8 @@ class DBTestCase(unittest.TestCase):
                 category="cat",
                 subcategory="subt",
                 created_by_admin_id=admin.id,
-                created_at=now,
-                updated_at=now,
+                created_at=NOW,
+                updated_at=NOW,
             )
             nft_other = NFTDefinition(
                 prefix="O",
@@ -840,8 +799,8 @@ class DBTestCase(unittest.TestCase):
                 category="cat",
                 subcategory="subo",
                 created_by_admin_id=admin.id,
-                created_at=now,
-                updated_at=now,
+                created_at=NOW,
+                updated_at=NOW,
             )
             user = User(in_app_id="u1", paymail="wallet1")
             session.add_all([nft_main, nft_other, user])
@@ -849,25 +808,21 @@ class DBTestCase(unittest.TestCase):
 
             nft_main.issue_dbwise_to_user(session, user)
 
-            card = BingoCard(user_id=user.id, issued_at=now)
+            card = BingoCard(user_id=user.id, issued_at=NOW)
             session.add(card)
             session.flush()
 
-            cells = [
-                BingoCell(bingo_card_id=card.id, idx=0, target_definition_id=nft_main.id)
-            ]
-            for i in range(1, 9):
-                cells.append(
-                    BingoCell(
-                        bingo_card_id=card.id,
-                        idx=i,
-                        target_definition_id=nft_other.id,
-                    )
-                )
-            for c in cells:
-                card.cells.append(c)
-                session.add(c)
-            session.flush()
+            cells = session.scalars(
+                insert(BingoCell).returning(BingoCell, sort_by_parameter_order=True),
+                [
+                    {
+                        "bingo_card_id": card.id,
+                        "idx": i,
+                        "target_definition_id": (nft_main if i == 0 else nft_other).id,
+                    }
+                    for i in range(9)
+                ],
+            ).all()
 
             cell = cells[0]
             self.assertEqual(cell.state, "locked")
@@ -889,9 +844,8 @@ class DBTestCase(unittest.TestCase):
             self.assertEqual(cell.matched_nft_instance_id, user.nft_instances[0].id)
 
     def test_user_unlock_bingo_cells_keyword_hard_break(self):
-        now = datetime.now(timezone.utc)
-        with self.Session() as session:
-            admin = Admin(email="unlock-cells-admin@example.com", password_hash="x")
+        with self.Session.begin() as session:
+            admin = _make_admin("unlock-cells-admin@example.com")
             user = User(in_app_id="unlock-cells-user", paymail="unlock-cells-wallet")
             session.add_all([admin, user])
             session.flush()
@@ -902,14 +856,11 @@ class DBTestCase(unittest.TestCase):
                 name="Unlock Cells",
                 nft_type="default",
                 created_by_admin_id=admin.id,
-                created_at=now,
-                updated_at=now,
+                created_at=NOW,
+                updated_at=NOW,
             )
-            session.add(definition)
-            session.flush()
-
-            card = BingoCard(user_id=user.id, issued_at=now, state="active")
-            session.add(card)
+            card = BingoCard(user_id=user.id, issued_at=NOW, state="active")
+            session.add_all([definition, card])
             session.flush()
 
             cell = BingoCell(
@@ -918,17 +869,14 @@ class DBTestCase(unittest.TestCase):
                 target_definition_id=definition.id,
                 state="locked",
             )
-            session.add(cell)
-            session.flush()
-
             nft_instance = NFTInstance(
                 user_id=user.id,
                 definition_id=definition.id,
                 serial_number=0,
                 unique_instance_id="UNLOCK-CELLS-AAAAAAAAAAAA",
-                acquired_at=now,
+                acquired_at=NOW,
             )
-            session.add(nft_instance)
+            session.add_all([cell, nft_instance])
             session.flush()
 
             unlocked = user.unlock_bingo_cells(session, nft_instance=nft_instance)
@@ -940,34 +888,38 @@ class DBTestCase(unittest.TestCase):
                 user.unlock_bingo_cells(session, instance=nft_instance)
 
     def test_bingocard_generate_for_user(self):
-        now = datetime.now(timezone.utc)
         rng = random.Random(0)
-        with self.Session() as session:
-            admin = Admin(email="admin@example.com", password_hash="x")
+        with self.Session.begin() as session:
+            admin = _make_admin()
             session.add(admin)
             session.flush()
 
-            definitions = [
-                NFTDefinition(
-                    prefix=f"T{i}",
-                    shared_key=f"shared-{i}",
-                    name=f"T{i}",
-                    nft_type="default",
-                    category="cat",
-                    subcategory=f"s{i}",
-                    created_by_admin_id=admin.id,
-                    created_at=now,
-                    updated_at=now,
-                    triggers_bingo_card=(i == 0),
-                )
-                for i in range(10)
-            ]
+            session.execute(
+                insert(NFTDefinition),
+                [
+                    {
+                        "prefix": f"T{i}",
+                        "shared_key": f"shared-{i}",
+                        "name": f"T{i}",
+                        "nft_type": "default",
+                        "category": "cat",
+                        "subcategory": f"s{i}",
+                        "created_by_admin_id": admin.id,
+                        "created_at": NOW,
+                        "updated_at": NOW,
+                        "triggers_bingo_card": i == 0,
+                    }
+                    for i in range(10)
+                ],
+            )
+            definitions = session.scalars(
+                select(NFTDefinition).order_by(NFTDefinition.id)
+            ).all()
             user = User(in_app_id="u1", paymail="wallet1")
-            session.add_all(definitions + [user])
+            session.add(user)
             session.flush()
 
             definitions[0].issue_dbwise_to_user(session, user)
-            session.commit()
 
             card = BingoCard.generate_for_user(
                 session=session,
@@ -981,9 +933,8 @@ class DBTestCase(unittest.TestCase):
             self.assertEqual(center.state, "unlocked")
 
     def test_user_ensure_bingo_cards(self):
-        now = datetime.now(timezone.utc)
-        with self.Session() as session:
-            admin = Admin(email="admin@example.com", password_hash="x")
+        with self.Session.begin() as session:
+            admin = _make_admin()
             session.add(admin)
             session.flush()
 
@@ -995,40 +946,25 @@ class DBTestCase(unittest.TestCase):
                 category="cat",
                 subcategory="subtr",
                 created_by_admin_id=admin.id,
-                created_at=now,
-                updated_at=now,
+                created_at=NOW,
+                updated_at=NOW,
                 triggers_bingo_card=True,
             )
-            others = [
-                NFTDefinition(
-                    prefix=f"O{i}",
-                    shared_key=f"shared-o{i}",
-                    name=f"O{i}",
-                    nft_type="default",
-                    category="cat",
-                    subcategory=f"so{i}",
-                    created_by_admin_id=admin.id,
-                    created_at=now,
-                    updated_at=now,
-                )
-                for i in range(8)
-            ]
+            _bulk_definitions(session, admin, [f"O{i}" for i in range(8)])
             user = User(in_app_id="u1", paymail="wallet1")
-            session.add_all([trigger, user] + others)
+            session.add_all([trigger, user])
             session.flush()
 
             trigger.issue_dbwise_to_user(session, user)
-            session.commit()
 
             created = user.ensure_bingo_cards(session)
-            session.commit()
+            session.flush()
             self.assertEqual(created, 1)
             self.assertEqual(len(user.bingo_cards), 1)
 
     def test_user_ensure_bingo_cells(self):
-        now = datetime.now(timezone.utc)
-        with self.Session() as session:
-            admin = Admin(email="admin@example.com", password_hash="x")
+        with self.Session.begin() as session:
+            admin = _make_admin()
             session.add(admin)
             session.flush()
 
@@ -1040,8 +976,8 @@ class DBTestCase(unittest.TestCase):
                 category="cat",
                 subcategory="subtr",
                 created_by_admin_id=admin.id,
-                created_at=now,
-                updated_at=now,
+                created_at=NOW,
+                updated_at=NOW,
                 triggers_bingo_card=True,
             )
             nft_unlock = NFTDefinition(
@@ -1052,32 +988,18 @@ class DBTestCase(unittest.TestCase):
                 category="cat",
                 subcategory="subun",
                 created_by_admin_id=admin.id,
-                created_at=now,
-                updated_at=now,
-            )
-            others = [
-                NFTDefinition(
-                    prefix=f"O{i}",
-                    shared_key=f"shared-o{i}",
-                    name=f"O{i}",
-                    nft_type="default",
-                    category="cat",
-                    subcategory=f"so{i}",
-                    created_by_admin_id=admin.id,
-                    created_at=now,
-                    updated_at=now,
-                )
-                for i in range(7)
-            ]
+                created_at=NOW,
+                updated_at=NOW,
+            )
+            _bulk_definitions(session, admin, [f"O{i}" for i in range(7)])
             user = User(in_app_id="u1", paymail="wallet1")
-            session.add_all([nft_trigger, nft_unlock, user] + others)
+            session.add_all([nft_trigger, nft_unlock, user])
             session.flush()
 
             nft_trigger.issue_dbwise_to_user(session, user)
-            session.commit()
 
             created = user.ensure_bingo_cards(session)
-            session.commit()
+            session.flush()
             self.assertEqual(created, 1)
 
             card = user.bingo_cards[0]
@@ -1088,20 +1010,19 @@ class DBTestCase(unittest.TestCase):
                 session,
                 user,
                 unique_instance_id=f"{nft_unlock.prefix}-A1B2C3D4E5F6",
-                acquired_at=now,
+                acquired_at=NOW,
             )
 
             unlocked = user.ensure_bingo_cells(session)
-            session.commit()
+            session.flush()
             self.assertEqual(unlocked, 0)
             self.assertEqual(cell.state, "unlocked")
             self.assertEqual(cell.definition_id, nft_unlock.id)
             self.assertEqual(cell.matched_nft_instance_id, ownership.id)
 
     def test_ownership_get_by_user_and_definition(self):
-        now = datetime.now(timezone.utc)
-        with self.Session() as session:
-            admin = Admin(email="admin@example.com", password_hash="x")
+        with self.Session.begin() as session:
+            admin = _make_admin()
             session.add(admin)
             session.flush()
 
@@ -1113,15 +1034,14 @@ class DBTestCase(unittest.TestCase):
                 category="cat",
                 subcategory="subt",
                 created_by_admin_id=admin.id,
-                created_at=now,
-                updated_at=now,
+                created_at=NOW,
+                updated_at=NOW,
             )
             user = User(in_app_id="u1", paymail="wallet1")
             session.add_all([nft, user])
             session.flush()
 
             nft.issue_dbwise_to_user(session, user)
-            session.commit()
 
             ownership = NFTInstance.get_by_user_and_definition(session, user, nft)
             self.assertIsNotNone(ownership)
@@ -1136,17 +1056,17 @@ class DBTestCase(unittest.TestCase):
             self.assertEqual(ownership2.id, ownership.id)
 
     def test_sync_nft_instances_from_chain_requires_on_chain_id(self):
-        with self.Session() as session:
+        with self.Session.begin() as session:
             user = User(in_app_id="u-sync-none", paymail="wallet-none")
             session.add(user)
             session.flush()
 
-            client = cast(ChainClient, DummyChainClient([]))
+            client_stub = DummyChainClient([])
 
             with warnings.catch_warnings():
                 warnings.simplefilter("ignore", UserWarning)
                 with self.assertRaises(ValueError):
-                    user.sync_nft_instances_from_chain(session, client=client)
+                    user.sync_nft_instances_from_chain(session, client=client_stub)
 
     def test_sync_nft_instances_from_chain_creates_local_records(self):
         created_at = datetime(2024, 1, 1, 12, 0, tzinfo=timezone.utc)
@@ -1176,19 +1096,15 @@ class DBTestCase(unittest.TestCase):
             }
         ]
 
-        with self.Session() as session:
-            admin = Admin(email="admin-sync@example.com", password_hash="x")
-            session.add(admin)
-            session.flush()
-
+        with self.Session.begin() as session:
+            admin = _make_admin("admin-sync@example.com")
             user = User(
                 in_app_id="u-sync", paymail="wallet-sync", on_chain_id="chain-user"
             )
-            session.add(user)
+            session.add_all([admin, user])
             session.flush()
 
             client_stub = DummyChainClient(chain_items)
-            client = cast(ChainClient, client_stub)
 
             with patch(
                 "nictbw.models.utils.generate_unique_instance_id",
@@ -1196,7 +1112,7 @@ class DBTestCase(unittest.TestCase):
             ):
                 with warnings.catch_warnings():
                     warnings.simplefilter("ignore", UserWarning)
-                    user.sync_nft_instances_from_chain(session, client=client)
+                    user.sync_nft_instances_from_chain(session, client=client_stub)
 
             self.assertEqual(client_stub.requested_usernames, ["chain-user"])
 
@@ -1269,17 +1185,14 @@ class DBTestCase(unittest.TestCase):
             }
         ]
 
-        with self.Session() as session:
-            admin = Admin(email="admin-update@example.com", password_hash="x")
-            session.add(admin)
-            session.flush()
-
+        with self.Session.begin() as session:
+            admin = _make_admin("admin-update@example.com")
             user = User(
                 in_app_id="u-sync-update",
                 paymail="wallet-update",
                 on_chain_id="chain-update",
             )
-            session.add(user)
+            session.add_all([admin, user])
             session.flush()
 
             nft = NFTDefinition(
@@ -1312,50 +1225,44 @@ class DBTestCase(unittest.TestCase):
             session.flush()
 
             client_stub = DummyChainClient(chain_items)
-            client = cast(ChainClient, client_stub)
 
             with warnings.catch_warnings():
                 warnings.simplefilter("ignore", UserWarning)
-                user.sync_nft_instances_from_chain(session, client=client)
+                user.sync_nft_instances_from_chain(session, client=client_stub)
 
             self.assertEqual(client_stub.requested_usernames, ["chain-update"])
 
-            refreshed_nft = session.get(NFTDefinition, nft.id)
-            assert refreshed_nft is not None
-            self.assertEqual(refreshed_nft.shared_key, "new-shared")
-            self.assertEqual(refreshed_nft.name, "Updated NFTDefinition Name")
-            self.assertEqual(refreshed_nft.category, "new-cat")
-            self.assertEqual(refreshed_nft.subcategory, "new-sub")
-            self.assertEqual(refreshed_nft.description, "Updated description")
-            self.assertEqual(refreshed_nft.image_url, "https://example.com/new.png")
+            self.assertEqual(nft.shared_key, "new-shared")
+            self.assertEqual(nft.name, "Updated NFTDefinition Name")
+            self.assertEqual(nft.category, "new-cat")
+            self.assertEqual(nft.subcategory, "new-sub")
+            self.assertEqual(nft.description, "Updated description")
+            self.assertEqual(nft.image_url, "https://example.com/new.png")
             self.assertEqual(
-                refreshed_nft.created_at.replace(tzinfo=None),
+                nft.created_at.replace(tzinfo=None),
                 chain_created.replace(tzinfo=None),
             )
             self.assertEqual(
-                refreshed_nft.updated_at.replace(tzinfo=None),
+                nft.updated_at.replace(tzinfo=None),
                 chain_updated.replace(tzinfo=None),
             )
 
-            refreshed_ownership = session.get(NFTInstance, ownership.id)
-            assert refreshed_ownership is not None
-            self.assertEqual(refreshed_ownership.unique_instance_id, "TPL-BBBBBBBBBBBB")
-            self.assertEqual(refreshed_ownership.nft_origin, "origin-xyz")
-            self.assertEqual(refreshed_ownership.current_nft_location, "new-location")
+            self.assertEqual(ownership.unique_instance_id, "TPL-BBBBBBBBBBBB")
+            self.assertEqual(ownership.nft_origin, "origin-xyz")
+            self.assertEqual(ownership.current_nft_location, "new-location")
             self.assertEqual(
-                refreshed_ownership.acquired_at.replace(tzinfo=None),
+                ownership.acquired_at.replace(tzinfo=None),
                 chain_created.replace(tzinfo=None),
             )
-            self.assertIsNotNone(refreshed_ownership.other_meta)
-            assert refreshed_ownership.other_meta is not None
-            new_meta = json.loads(refreshed_ownership.other_meta)
+            self.assertIsNotNone(ownership.other_meta)
+            assert ownership.other_meta is not None
+            new_meta = json.loads(ownership.other_meta)
             self.assertEqual(new_meta["description"], "Updated description")
             self.assertEqual(new_meta["subcategory"], "new-sub")
 
     def test_prize_draw_models_roundtrip(self):
-        now = datetime.now(timezone.utc)
-        with self.Session() as session:
-            admin = Admin(email="draw-admin@example.com", password_hash="x")
+        with self.Session.begin() as session:
+            admin = _make_admin("draw-admin@example.com")
             session.add(admin)
             session.flush()
 
@@ -1369,21 +1276,18 @@ class DBTestCase(unittest.TestCase):
                 created_by_admin_id=admin.id,
             )
             user = User(in_app_id="draw-user", paymail="draw-wallet")
-            session.add_all([nft, user])
-            session.flush()
-
-            ownership = nft.issue_dbwise_to_user(
-                session, user, nft_origin="origin-seed", acquired_at=now
-            )
-
             draw_type = PrizeDrawType(
                 internal_name="immediate",
                 algorithm_key="sha256_hex_proximity",
                 default_threshold=0.5,
             )
-            session.add(draw_type)
+            session.add_all([nft, user, draw_type])
             session.flush()
 
+            ownership = nft.issue_dbwise_to_user(
+                session, user, nft_origin="origin-seed", acquired_at=NOW
+            )
+
             fetched_type = PrizeDrawType.get_by_internal_name(session, "immediate")
             self.assertIsNotNone(fetched_type)
             assert fetched_type is not None
@@ -1393,12 +1297,9 @@ class DBTestCase(unittest.TestCase):
                 draw_type_id=draw_type.id,
                 value="101010",
             )
-            session.add(winning_number)
-            session.flush()
-
             result = PrizeDrawResult(
                 draw_type_id=draw_type.id,
-                winning_number_id=winning_number.id,
+                winning_number=winning_number,
                 user_id=user.id,
                 definition_id=nft.id,
                 nft_instance_id=ownership.id,
@@ -1407,21 +1308,19 @@ class DBTestCase(unittest.TestCase):
                 threshold_used=3.0,
                 outcome="lose",
             )
-            session.add(result)
-            session.commit()
+            session.add_all([winning_number, result])
+            session.flush()
 
-            retrieved = session.get(PrizeDrawResult, result.id)
-            assert retrieved is not None
             self.assertFalse(hasattr(PrizeDrawResult, "ownership_id"))
-            self.assertEqual(retrieved.draw_type_id, draw_type.id)
-            self.assertEqual(retrieved.winning_number_id, winning_number.id)
-            self.assertEqual(retrieved.outcome, "lose")
-            self.assertIsNotNone(retrieved.draw_type)
-            assert retrieved.draw_type is not None
-            self.assertEqual(retrieved.draw_type.results[0].id, result.id)
-            self.assertIsNotNone(retrieved.winning_number)
-            assert retrieved.winning_number is not None
-            self.assertEqual(retrieved.winning_number.results[0].id, result.id)
+            self.assertEqual(result.draw_type_id, draw_type.id)
+            self.assertEqual(result.winning_number_id, winning_number.id)
+            self.assertEqual(result.outcome, "lose")
+            self.assertIsNotNone(result.draw_type)
+            assert result.draw_type is not None
+            self.assertEqual(result.draw_type.results[0].id, result.id)
+            self.assertIsNotNone(result.winning_number)
+            assert result.winning_number is not None
+            self.assertEqual(result.winning_number.results[0].id, result.id)
 
             duplicate = PrizeDrawResult(
                 draw_type_id=draw_type.id,
@@ -1431,9 +1330,9 @@ class DBTestCase(unittest.TestCase):
                 draw_number="101111",
                 outcome="win",
             )
-            session.add(duplicate)
             with self.assertRaises(IntegrityError):
-                session.commit()
+                with session.begin_nested():
+                    session.add(duplicate)
 
     def test_removed_legacy_instance_aliases(self):
         self.assertFalse(hasattr(User, "ownerships"))
@@ -1494,7 +1393,7 @@ class DBTestCase(unittest.TestCase):
                     definition_id=1,
                     serial_number=1,
                     unique_instance_id="OLD-AAAAAAAAAAAA",
-                    acquired_at=datetime.now(timezone.utc),
+                    acquired_at=NOW,
                 ),
                 draw_number="x",
             )
@@ -1516,7 +1415,7 @@ class DBTestCase(unittest.TestCase):
                     definition_id=1,
                     serial_number=1,
                     unique_instance_id="OLD-EEEEEEEEEEEE",
-                    acquired_at=datetime.now(timezone.utc),
+                    acquired_at=NOW,
                 ),
                 draw_number="x",
             )
@@ -1538,7 +1437,7 @@ class DBTestCase(unittest.TestCase):
                     definition_id=1,
                     serial_number=1,
                     unique_instance_id="OLD-BBBBBBBBBBBB",
-                    acquired_at=datetime.now(timezone.utc),
+                    acquired_at=NOW,
                 ),
             )
         with self.assertRaises(TypeError):
@@ -1558,7 +1457,7 @@ class DBTestCase(unittest.TestCase):
                     definition_id=1,
                     serial_number=1,
                     unique_instance_id="OLD-FFFFFFFFFFFF",
-                    acquired_at=datetime.now(timezone.utc),
+                    acquired_at=NOW,
                 ),
             )
 
@@ -1583,7 +1482,7 @@ class DBTestCase(unittest.TestCase):
                     definition_id=1,
                     serial_number=1,
                     unique_instance_id="OLD-CCCCCCCCCCCC",
-                    acquired_at=datetime.now(timezone.utc),
+                    acquired_at=NOW,
                 ),
             )
         with self.assertRaises(TypeError):
@@ -1607,7 +1506,7 @@ class DBTestCase(unittest.TestCase):
                     definition_id=1,
                     serial_number=1,
                     unique_instance_id="OLD-GGGGGGGGGGGG",
-                    acquired_at=datetime.now(timezone.utc),
+                    acquired_at=NOW,
                 ),
             )
 
@@ -1621,7 +1520,7 @@ class DBTestCase(unittest.TestCase):
                     definition_id=1,
                     serial_number=1,
                     unique_instance_id="OLD-DDDDDDDDDDDD",
-                    acquired_at=datetime.now(timezone.utc),
+                    acquired_at=NOW,
                 ),
             )
         with self.assertRaises(TypeError):
@@ -1634,7 +1533,7 @@ class DBTestCase(unittest.TestCase):
                     definition_id=1,
                     serial_number=1,
                     unique_instance_id="OLD-HHHHHHHHHHHH",
-                    acquired_at=datetime.now(timezone.utc),
+                    acquired_at=NOW,
                 ),
             )
 
@@ -6,10 +6,13 @@ from nictbw.prize_draw import (
     AlgorithmRegistry,
     DEFAULT_SCORING_REGISTRY,
     ScoreEvaluation,
-    ScoringAlgorithm,
     derive_draw_number,
 )
 
+# Expected (score, draw_top_digits, winning_top_digits) for sha256_hex_proximity.
+_ABCD_VS_ABCE = (0.8769994616139306, "6188938426", "6011386400")
+_A_VS_B = (0.09205801963150056, "3872030720", "1010891671")
+
 
 class DrawNumberGenerationTests(unittest.TestCase):
     def test_default_generator_is_stable(self) -> None:
@@ -34,16 +37,25 @@ class ScoringRegistryTests(unittest.TestCase):
         available = DEFAULT_SCORING_REGISTRY.available_algorithms()
         self.assertIn("sha256_hex_proximity", available)
 
+    # (left, right, threshold, expected) vectors for sha256_hex_proximity.
+    SHA256_VECTORS = (
+        ("abcd", "abce", 0.8, _ABCD_VS_ABCE),
+        ("A", "B", 0.05, _A_VS_B),
+    )
+
     def test_sha256_hex_similarity_with_threshold(self) -> None:
-        result = DEFAULT_SCORING_REGISTRY.evaluate(
-            "sha256_hex_proximity", "abcd", "abce", threshold=0.8
-        )
-        self.assertIsInstance(result, ScoreEvaluation)
-        self.assertEqual(result.algorithm_key, "sha256_hex_proximity")
-        self.assertAlmostEqual(result.score, 0.8769994616139306)
-        self.assertEqual(result.draw_top_digits, "6188938426")
-        self.assertEqual(result.winning_top_digits, "6011386400")
-        self.assertTrue(result.passed)
+        for left, right, threshold, expected in self.SHA256_VECTORS:
+            with self.subTest(left=left, right=right):
+                result = DEFAULT_SCORING_REGISTRY.evaluate(
+                    "sha256_hex_proximity", left, right, threshold=threshold
+                )
+                self.assertIsInstance(result, ScoreEvaluation)
+                self.assertEqual(result.algorithm_key, "sha256_hex_proximity")
+                score, draw_digits, winning_digits = expected
+                self.assertAlmostEqual(result.score, score)
+                self.assertEqual(result.draw_top_digits, draw_digits)
+                self.assertEqual(result.winning_top_digits, winning_digits)
+                self.assertTrue(result.passed)
 
     def test_custom_registry_registration(self) -> None:
         registry = AlgorithmRegistry()
@@ -54,9 +66,10 @@ class ScoringRegistryTests(unittest.TestCase):
             registry.register(DEFAULT_SCORING_REGISTRY.get("sha256_hex_proximity"))
         evaluation = registry.evaluate("sha256_hex_proximity", "A", "B", threshold=0.05)
         # SHA-256 hashed values for A and B yield a low similarity via the hex scorer.
-        self.assertAlmostEqual(evaluation.score, 0.09205801963150056)
-        self.assertEqual(evaluation.draw_top_digits, "3872030720")
-        self.assertEqual(evaluation.winning_top_digits, "1010891671")
+        score, draw_digits, winning_digits = _A_VS_B
+        self.assertAlmostEqual(evaluation.score, score)
+        self.assertEqual(evaluation.draw_top_digits, draw_digits)
+        self.assertEqual(evaluation.winning_top_digits, winning_digits)
         self.assertTrue(evaluation.passed)
 
 if __name__ == "__main__":
@@ -2,20 +2,24 @@ from __future__ import annotations
 
 import unittest
 from datetime import datetime, timezone
-from typing import cast
+from types import SimpleNamespace
+from typing import Sequence, cast
+from unittest.mock import Mock
 
-from sqlalchemy import create_engine, select
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy import func, insert, select
+from sqlalchemy.orm import Session
+
+from tests.db_fixture import NOW, SqliteInMemoryTestCase, seed_admin_and_user
 
 from nictbw.models import (
     Admin,
-    Base,
     BingoCard,
     BingoCell,
     NFTDefinition,
     NFTInstance,
     PrizeDrawResult,
     PrizeDrawType,
+    PrizeDrawWinningNumber,
     User,
 )
 from nictbw.workflows import (
@@ -28,29 +32,37 @@ from nictbw.workflows import (
     submit_winning_number,
 )
 
+# Expected (score, draw_top_digits, winning_top_digits) for draw number "abc"
+# against winning number "abd" under sha256_hex_proximity.
+_ABC_VS_ABD = (0.7752364105046057, "8434236848", "7471127736")
 
-class PrizeDrawWorkflowTests(unittest.TestCase):
-    def setUp(self) -> None:
-        self.engine = create_engine("sqlite+pysqlite:///:memory:", future=True)
-        Base.metadata.create_all(self.engine)
-        self.Session = sessionmaker(
-            bind=self.engine, future=True, expire_on_commit=False
-        )
+# Cards with a completed line seeded for the bingo draw query-count test.
+_COMPLETED_CARDS = 3
 
-    def tearDown(self) -> None:
-        self.engine.dispose()
 
-    def _seed_user_and_admin(self, session):
-        admin = Admin(email="admin@example.com", password_hash="x")
-        user = User(in_app_id="draw-user", paymail="wallet@example.com")
-        session.add_all([admin, user])
-        session.flush()
-        return user, admin
+def _make_draw_type(
+    internal_name: str, *, default_threshold: float | None = None
+) -> PrizeDrawType:
+    return PrizeDrawType(
+        internal_name=internal_name,
+        algorithm_key="sha256_hex_proximity",
+        default_threshold=default_threshold,
+    )
+
+
+class PrizeDrawWorkflowTests(SqliteInMemoryTestCase):
+    @classmethod
+    def seed_fixtures(cls, session) -> None:
+        cls.admin_id, cls.user_id = seed_admin_and_user(
+            session,
+            email="admin@example.com",
+            in_app_id="draw-user",
+            paymail="wallet@example.com",
+        )
 
     def _mint_nft(self, session, admin: Admin, user: User, *, origin: str) -> NFTInstance:
-        prefix = f"NFTDefinition-{origin}"
         definition = NFTDefinition(
-            prefix=prefix,
+            prefix=f"NFTDefinition-{origin}",
             shared_key=f"key-{origin}",
             name=f"NFTDefinition {origin}",
             nft_type="default",
@@ -62,16 +74,49 @@ class PrizeDrawWorkflowTests(unittest.TestCase):
         session.flush()
         return definition.issue_dbwise_to_user(session, user, nft_origin=origin)
 
+    def _bulk_mint_nfts(
+        self, session, admin: Admin, user: User, origins: Sequence[str]
+    ) -> list[NFTInstance]:
+        """Insert one instance per origin without ``issue_dbwise_to_user``.
+
+        Serials, ``minted_count`` and ``unique_instance_id`` are filled in by
+        hand; use ``_mint_nft`` where the issuance path itself is under test.
+        """
+        definition = NFTDefinition(
+            prefix=f"NFTDefinition-{origins[0]}",
+            shared_key=f"key-{origins[0]}",
+            name=f"NFTDefinition {origins[0]}",
+            nft_type="default",
+            category="event",
+            subcategory="game",
+            created_by_admin_id=admin.id,
+            minted_count=len(origins),
+        )
+        session.add(definition)
+        session.flush()
+        return session.scalars(
+            insert(NFTInstance).returning(NFTInstance, sort_by_parameter_order=True),
+            [
+                {
+                    "user_id": user.id,
+                    "definition_id": definition.id,
+                    "serial_number": serial,
+                    "unique_instance_id": f"{definition.prefix}-{serial}",
+                    "acquired_at": NOW,
+                    "status": "succeeded",
+                    "nft_origin": origin,
+                }
+                for serial, origin in enumerate(origins)
+            ],
+        ).all()
+
     def test_run_prize_draw_overwrites_result(self) -> None:
         with self.Session.begin() as session:
-            user, admin = self._seed_user_and_admin(session)
+            admin = session.get(Admin, self.admin_id)
+            user = session.get(User, self.user_id)
             instance = self._mint_nft(session, admin, user, origin="ABC")
 
-            draw_type = PrizeDrawType(
-                internal_name="instant",
-                algorithm_key="sha256_hex_proximity",
-                default_threshold=0.8,
-            )
+            draw_type = _make_draw_type("instant", default_threshold=0.8)
             session.add(draw_type)
             session.flush()
 
@@ -81,18 +126,16 @@ class PrizeDrawWorkflowTests(unittest.TestCase):
                 value="abd",
             )
 
+            score, draw_digits, winning_digits = _ABC_VS_ABD
             lose_threshold = 0.8
             first_result = run_prize_draw(
                 session, instance, draw_type, winning_number, threshold=lose_threshold
             )
             self.assertEqual(first_result.outcome, "lose")
             self.assertIsNotNone(first_result.similarity_score)
-            self.assertAlmostEqual(
-                cast(float, first_result.similarity_score),
-                0.7752364105046057,
-            )
-            self.assertEqual(first_result.draw_top_digits, "8434236848")
-            self.assertEqual(first_result.winning_top_digits, "7471127736")
+            self.assertAlmostEqual(cast(float, first_result.similarity_score), score)
+            self.assertEqual(first_result.draw_top_digits, draw_digits)
+            self.assertEqual(first_result.winning_top_digits, winning_digits)
             self.assertEqual(first_result.threshold_used, lose_threshold)
             result_id = first_result.id
 
@@ -107,26 +150,21 @@ class PrizeDrawWorkflowTests(unittest.TestCase):
             self.assertEqual(second_result.outcome, "win")
             self.assertEqual(second_result.threshold_used, 0.7)
             self.assertIsNotNone(second_result.similarity_score)
-            self.assertAlmostEqual(
-                cast(float, second_result.similarity_score),
-                0.7752364105046057,
-            )
-            self.assertEqual(second_result.draw_top_digits, "8434236848")
-            self.assertEqual(second_result.winning_top_digits, "7471127736")
+            self.assertAlmostEqual(cast(float, second_result.similarity_score), score)
+            self.assertEqual(second_result.draw_top_digits, draw_digits)
+            self.assertEqual(second_result.winning_top_digits, winning_digits)
             self.assertEqual(second_result.user_id, user.id)
             self.assertIsNotNone(second_result.nft_instance_id)
 
     def test_run_prize_draw_batch_uses_latest_winning_number(self) -> None:
         with self.Session.begin() as session:
-            user, admin = self._seed_user_and_admin(session)
-            instance_one = self._mint_nft(session, admin, user, origin="abc")
-            instance_two = self._mint_nft(session, admin, user, origin="abz")
-
-            draw_type = PrizeDrawType(
-                internal_name="batch",
-                algorithm_key="sha256_hex_proximity",
-                default_threshold=0.5,
+            admin = session.get(Admin, self.admin_id)
+            user = session.get(User, self.user_id)
+            instance_one, instance_two = self._bulk_mint_nfts(
+                session, admin, user, ["abc", "abz"]
             )
+
+            draw_type = _make_draw_type("batch", default_threshold=0.5)
             session.add(draw_type)
             session.flush()
 
@@ -154,14 +192,11 @@ class PrizeDrawWorkflowTests(unittest.TestCase):
 
     def test_run_prize_draw_keyword_hard_breaks(self) -> None:
         with self.Session.begin() as session:
-            user, admin = self._seed_user_and_admin(session)
+            admin = session.get(Admin, self.admin_id)
+            user = session.get(User, self.user_id)
             nft_instance = self._mint_nft(session, admin, user, origin="KW")
 
-            draw_type = PrizeDrawType(
-                internal_name="keyword-breaks",
-                algorithm_key="sha256_hex_proximity",
-                default_threshold=0.5,
-            )
+            draw_type = _make_draw_type("keyword-breaks", default_threshold=0.5)
             session.add(draw_type)
             session.flush()
             winning_number = submit_winning_number(session, draw_type, value="kw")
@@ -184,12 +219,7 @@ class PrizeDrawWorkflowTests(unittest.TestCase):
 
     def test_run_prize_draw_batch_empty_ids_returns_empty(self) -> None:
         with self.Session.begin() as session:
-            user, _admin = self._seed_user_and_admin(session)
-            draw_type = PrizeDrawType(
-                internal_name="empty",
-                algorithm_key="sha256_hex_proximity",
-                default_threshold=1.0,
-            )
+            draw_type = _make_draw_type("empty", default_threshold=1.0)
             session.add(draw_type)
             session.flush()
 
@@ -200,10 +230,9 @@ class PrizeDrawWorkflowTests(unittest.TestCase):
 
     def test_run_prize_draw_batch_allows_same_definition_instances(self) -> None:
         with self.Session.begin() as session:
-            user_one, admin = self._seed_user_and_admin(session)
+            admin = session.get(Admin, self.admin_id)
+            user_one = session.get(User, self.user_id)
             user_two = User(in_app_id="draw-user-2", paymail="draw-user-2@wallet")
-            session.add(user_two)
-            session.flush()
 
             definition = NFTDefinition(
                 prefix="BATCH-CONFLICT",
@@ -214,7 +243,8 @@ class PrizeDrawWorkflowTests(unittest.TestCase):
                 subcategory="game",
                 created_by_admin_id=admin.id,
             )
-            session.add(definition)
+            draw_type = _make_draw_type("batch-conflict")
+            session.add_all([user_two, definition, draw_type])
             session.flush()
 
             instance_one = definition.issue_dbwise_to_user(
@@ -224,13 +254,6 @@ class PrizeDrawWorkflowTests(unittest.TestCase):
                 session, user_two, nft_origin="conflict-2"
             )
 
-            draw_type = PrizeDrawType(
-                internal_name="batch-conflict",
-                algorithm_key="sha256_hex_proximity",
-                default_threshold=None,
-            )
-            session.add(draw_type)
-            session.flush()
             submit_winning_number(session, draw_type, value="conflict")
 
             results = run_prize_draw_batch(
@@ -249,10 +272,9 @@ class PrizeDrawWorkflowTests(unittest.TestCase):
 
     def test_run_prize_draw_persists_independent_results_per_instance(self) -> None:
         with self.Session.begin() as session:
-            user_one, admin = self._seed_user_and_admin(session)
+            admin = session.get(Admin, self.admin_id)
+            user_one = session.get(User, self.user_id)
             user_two = User(in_app_id="draw-user-3", paymail="draw-user-3@wallet")
-            session.add(user_two)
-            session.flush()
 
             definition = NFTDefinition(
                 prefix="SINGLE-CONFLICT",
@@ -263,7 +285,8 @@ class PrizeDrawWorkflowTests(unittest.TestCase):
                 subcategory="game",
                 created_by_admin_id=admin.id,
             )
-            session.add(definition)
+            draw_type = _make_draw_type("single-conflict")
+            session.add_all([user_two, definition, draw_type])
             session.flush()
 
             instance_one = definition.issue_dbwise_to_user(
@@ -273,13 +296,6 @@ class PrizeDrawWorkflowTests(unittest.TestCase):
                 session, user_two, nft_origin="single-conflict-2"
             )
 
-            draw_type = PrizeDrawType(
-                internal_name="single-conflict",
-                algorithm_key="sha256_hex_proximity",
-                default_threshold=None,
-            )
-            session.add(draw_type)
-            session.flush()
             winning_number = submit_winning_number(session, draw_type, value="single")
 
             first = run_prize_draw(
@@ -302,12 +318,9 @@ class PrizeDrawWorkflowTests(unittest.TestCase):
 
     def test_select_top_prize_draw_results_orders_by_similarity(self) -> None:
         with self.Session.begin() as session:
-            user, admin = self._seed_user_and_admin(session)
-            draw_type = PrizeDrawType(
-                internal_name="closest",
-                algorithm_key="sha256_hex_proximity",
-                default_threshold=None,
-            )
+            admin = session.get(Admin, self.admin_id)
+            user = session.get(User, self.user_id)
+            draw_type = _make_draw_type("closest")
             session.add(draw_type)
             session.flush()
 
@@ -317,24 +330,21 @@ class PrizeDrawWorkflowTests(unittest.TestCase):
                 value="abd",
             )
 
-            origins = ["abd", "abe", "abz"]
-            for origin in origins:
-                instance = self._mint_nft(session, admin, user, origin=origin)
-                result = run_prize_draw(
-                    session,
-                    instance,
-                    draw_type,
-                    winning_number,
-                )
+            instances = self._bulk_mint_nfts(
+                session, admin, user, ["abd", "abe", "abz"]
+            )
+            results = run_prize_draw_batch(
+                session,
+                draw_type,
+                winning_number=winning_number,
+                nft_instances=instances,
+            )
+            self.assertEqual(len(results), 3)
+            for result in results:
                 self.assertIsNone(result.threshold_used)
                 self.assertEqual(result.outcome, "pending")
                 self.assertIsNotNone(result.similarity_score)
 
-            with self.assertRaises(ValueError):
-                select_top_prize_draw_results(
-                    session, draw_type, winning_number, limit=0
-                )
-
             top_two = select_top_prize_draw_results(
                 session,
                 draw_type,
@@ -359,11 +369,7 @@ class PrizeDrawWorkflowTests(unittest.TestCase):
 
     def test_select_top_prize_draw_results_requires_winning_number(self) -> None:
         with self.Session.begin() as session:
-            draw_type = PrizeDrawType(
-                internal_name="no-winning-number",
-                algorithm_key="sha256_hex_proximity",
-                default_threshold=0.75,
-            )
+            draw_type = _make_draw_type("no-winning-number", default_threshold=0.75)
             session.add(draw_type)
             session.flush()
 
@@ -371,23 +377,41 @@ class PrizeDrawWorkflowTests(unittest.TestCase):
                 select_top_prize_draw_results(session, draw_type, limit=1)
 
 
-class PrizeDrawWorkflowSelectionTests(unittest.TestCase):
-    def setUp(self) -> None:
-        self.engine = create_engine("sqlite+pysqlite:///:memory:", future=True)
-        Base.metadata.create_all(self.engine)
-        self.Session = sessionmaker(
-            bind=self.engine, future=True, expire_on_commit=False
+class SelectTopPrizeDrawResultsValidationTests(unittest.TestCase):
+    # Argument validation runs before any query, so no database is needed.
+    def test_rejects_non_positive_limit(self) -> None:
+        session = Mock(spec=Session)
+        draw_type = _make_draw_type("validation")
+        draw_type.id = 1
+        for limit in (0, -1):
+            with self.subTest(limit=limit):
+                with self.assertRaises(ValueError):
+                    select_top_prize_draw_results(session, draw_type, limit=limit)
+        self.assertEqual(session.method_calls, [])
+
+    def test_rejects_unpersisted_draw_type(self) -> None:
+        session = Mock(spec=Session)
+        with self.assertRaises(ValueError):
+            select_top_prize_draw_results(
+                session, _make_draw_type("transient"), limit=1
+            )
+        self.assertEqual(session.method_calls, [])
+
+
+class PrizeDrawWorkflowSelectionTests(SqliteInMemoryTestCase):
+    @classmethod
+    def seed_fixtures(cls, session) -> None:
+        cls.admin_id, cls.user_id = seed_admin_and_user(
+            session,
+            email="admin@example.com",
+            in_app_id="draw-player",
+            paymail="player@example.com",
         )
 
-    def tearDown(self) -> None:
-        self.engine.dispose()
-
     def test_run_bingo_prize_draw_limits_to_completed_lines(self) -> None:
         with self.Session.begin() as session:
-            admin = Admin(email="admin@example.com", password_hash="x")
-            user = User(in_app_id="bingo-player", paymail="player@example.com")
-            session.add_all([admin, user])
-            session.flush()
+            admin = session.get(Admin, self.admin_id)
+            user = session.get(User, self.user_id)
 
             line_defs = [
                 NFTDefinition(
@@ -410,84 +434,86 @@ class PrizeDrawWorkflowSelectionTests(unittest.TestCase):
                 subcategory="filler",
                 created_by_admin_id=admin.id,
             )
-            session.add_all(line_defs + [filler_def])
+            cards = [
+                BingoCard(user_id=user.id, issued_at=NOW, state="active")
+                for _ in range(_COMPLETED_CARDS)
+            ]
+            session.add_all(line_defs + [filler_def] + cards)
             session.flush()
 
             instances: list[NFTInstance] = []
-            for i, definition in enumerate(line_defs):
-                instances.append(
-                    definition.issue_dbwise_to_user(session, user, nft_origin=f"origin-{i}")
-                )
-
-            ownership_by_nft = {o.definition_id: o for o in user.nft_instances}
-
-            card = BingoCard(
-                user_id=user.id,
-                issued_at=datetime.now(timezone.utc),
-                state="active",
-            )
-            session.add(card)
-            session.flush()
-
-            cells: list[BingoCell] = []
-            for idx in range(9):
-                unlocked = idx in (0, 1, 2)
-                definition_id = instances[idx].definition_id if unlocked else None
-                nft_instance_id = (
-                    ownership_by_nft[definition_id].id
-                    if unlocked and definition_id is not None
-                    else None
-                )
-                cells.append(
-                    BingoCell(
-                        bingo_card_id=card.id,
-                        idx=idx,
-                        target_definition_id=(
+            cell_rows = []
+            for card_no, card in enumerate(cards):
+                card_instances = [
+                    definition.issue_dbwise_to_user(
+                        session, user, nft_origin=f"origin-{card_no}-{i}"
+                    )
+                    for i, definition in enumerate(line_defs)
+                ]
+                instances.extend(card_instances)
+                cell_rows.extend(
+                    {
+                        "bingo_card_id": card.id,
+                        "idx": idx,
+                        "target_definition_id": (
                             line_defs[idx].id if idx < 3 else filler_def.id
                         ),
-                        definition_id=definition_id,
-                        matched_nft_instance_id=nft_instance_id,
-                        state="unlocked" if unlocked else "locked",
-                        unlocked_at=datetime.now(timezone.utc) if unlocked else None,
-                    )
+                        "definition_id": (
+                            card_instances[idx].definition_id if idx < 3 else None
+                        ),
+                        "matched_nft_instance_id": (
+                            card_instances[idx].id if idx < 3 else None
+                        ),
+                        "state": "unlocked" if idx < 3 else "locked",
+                        "unlocked_at": NOW if idx < 3 else None,
+                    }
+                    for idx in range(9)
                 )
-            card.cells.extend(cells)
-            session.flush()
+            session.execute(insert(BingoCell), cell_rows)
 
-            draw_type = PrizeDrawType(
-                internal_name="bingo-draw",
-                algorithm_key="sha256_hex_proximity",
-                default_threshold=None,
-            )
+            draw_type = _make_draw_type("bingo-draw")
             session.add(draw_type)
             session.flush()
             winning_number = submit_winning_number(
                 session,
                 draw_type,
-                value="origin-0",
+                value="origin-0-0",
             )
+            draw_type_id, winning_number_id = draw_type.id, winning_number.id
+            instance_ids = frozenset(inst.id for inst in instances)
 
-            winners = run_bingo_prize_draw(
-                session,
-                draw_type,
-                winning_number=winning_number,
-                limit=1,
-            )
+            # Start from an empty identity map so lazy loads cannot be served
+            # from objects the setup above already holds.
+            session.expunge_all()
+            draw_type = session.get(PrizeDrawType, draw_type_id)
+            winning_number = session.get(PrizeDrawWinningNumber, winning_number_id)
 
-            all_results = session.scalars(
-                select(PrizeDrawResult).where(PrizeDrawResult.draw_type_id == draw_type.id)
-            ).all()
+            with self.count_queries() as queries:
+                winners = run_bingo_prize_draw(
+                    session,
+                    draw_type,
+                    winning_number=winning_number,
+                    limit=1,
+                )
+            # Cards, cells and matched instances load in three queries whatever
+            # the number of cards; each eligible instance then costs one lookup
+            # and one insert.
+            self.assertEqual(len(queries), 3 + 2 * len(instance_ids))
 
-            self.assertEqual(len(all_results), 3)
+            result_count = session.scalar(
+                select(func.count())
+                .select_from(PrizeDrawResult)
+                .where(PrizeDrawResult.draw_type_id == draw_type.id)
+            )
+
+            self.assertEqual(result_count, len(instance_ids))
             self.assertEqual(len(winners), 1)
-            self.assertIn(winners[0].nft_instance_id, {inst.id for inst in instances[:3]})
+            self.assertIn(winners[0].nft_instance_id, instance_ids)
 
     def test_run_final_attendance_prize_draw_filters_by_prefix(self) -> None:
         with self.Session.begin() as session:
-            admin = Admin(email="admin2@example.com", password_hash="y")
-            user = User(in_app_id="final-player", paymail="final@example.com")
-            session.add_all([admin, user])
-            session.flush()
+            admin = session.get(Admin, self.admin_id)
+            user = session.get(User, self.user_id)
 
             attendance_nft = NFTDefinition(
                 prefix="FINAL-DAY",
@@ -507,7 +533,8 @@ class PrizeDrawWorkflowSelectionTests(unittest.TestCase):
                 subcategory="other",
                 created_by_admin_id=admin.id,
             )
-            session.add_all([attendance_nft, other_nft])
+            draw_type = _make_draw_type("final-attendance")
+            session.add_all([attendance_nft, other_nft, draw_type])
             session.flush()
 
             attendance_instance = attendance_nft.issue_dbwise_to_user(
@@ -517,13 +544,6 @@ class PrizeDrawWorkflowSelectionTests(unittest.TestCase):
                 session, user, nft_origin="other-origin"
             )
 
-            draw_type = PrizeDrawType(
-                internal_name="final-attendance",
-                algorithm_key="sha256_hex_proximity",
-                default_threshold=None,
-            )
-            session.add(draw_type)
-            session.flush()
             winning_number = submit_winning_number(
                 session,
                 draw_type,
@@ -538,50 +558,39 @@ class PrizeDrawWorkflowSelectionTests(unittest.TestCase):
                 limit=1,
             )
 
-            all_results = session.scalars(
-                select(PrizeDrawResult).where(PrizeDrawResult.draw_type_id == draw_type.id)
-            ).all()
+            result_count = session.scalar(
+                select(func.count())
+                .select_from(PrizeDrawResult)
+                .where(PrizeDrawResult.draw_type_id == draw_type.id)
+            )
 
-            self.assertEqual(len(all_results), 1)
+            self.assertEqual(result_count, 1)
             self.assertEqual(len(winners), 1)
             self.assertEqual(winners[0].nft_instance_id, attendance_instance.id)
             self.assertNotEqual(winners[0].nft_instance_id, other_instance.id)
 
     def test_rank_prize_draw_results_with_ties_includes_cutoff(self) -> None:
+        # Ranking only reads the score, evaluation time and id, so plain
+        # stand-ins avoid ORM instrumentation for this pure-function test.
         base_time = datetime(2024, 1, 1, tzinfo=timezone.utc)
-        top = PrizeDrawResult(
-            draw_type_id=1,
-            winning_number_id=1,
-            user_id=1,
-            definition_id=1,
-            nft_instance_id=1,
-            draw_number="top",
-            similarity_score=0.9,
-            evaluated_at=base_time,
+        top = SimpleNamespace(
+            id=None, definition_id=1, similarity_score=0.9, evaluated_at=base_time
         )
-        tie_a = PrizeDrawResult(
-            draw_type_id=1,
-            winning_number_id=1,
-            user_id=1,
+        tie_a = SimpleNamespace(
+            id=None,
             definition_id=2,
-            nft_instance_id=1,
-            draw_number="tie-a",
             similarity_score=0.8,
             evaluated_at=base_time.replace(hour=1),
         )
-        tie_b = PrizeDrawResult(
-            draw_type_id=1,
-            winning_number_id=1,
-            user_id=1,
+        tie_b = SimpleNamespace(
+            id=None,
             definition_id=3,
-            nft_instance_id=1,
-            draw_number="tie-b",
             similarity_score=0.8,
             evaluated_at=base_time.replace(hour=2),
         )
 
         winners = _rank_prize_draw_results_with_ties(
-            [tie_b, tie_a, top],
+            cast(list[PrizeDrawResult], [tie_b, tie_a, top]),
             limit=2,
         )
 
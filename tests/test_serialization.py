@@ -1,32 +1,26 @@
 import unittest
-from datetime import datetime, timezone
 import json
 
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy import insert, select
+from sqlalchemy.orm import raiseload, selectinload
 
-from nictbw.models import Base, Admin, User, NFTDefinition, BingoCard, BingoCell
+from tests.db_fixture import NOW, SqliteInMemoryTestCase, seed_admin_and_user
 
+from nictbw.models import NFTDefinition, BingoCard, BingoCell
 
-class SerializationTestCase(unittest.TestCase):
-    def setUp(self):
-        # In-memory SQLite for isolation
-        self.engine = create_engine("sqlite+pysqlite:///:memory:", future=True)
-        Base.metadata.create_all(self.engine)
-        self.Session = sessionmaker(
-            bind=self.engine, future=True, expire_on_commit=False
-        )
 
-    def tearDown(self):
-        self.engine.dispose()
+class SerializationTestCase(SqliteInMemoryTestCase):
+    @classmethod
+    def seed_fixtures(cls, session):
+        cls.admin_id, cls.user_id = seed_admin_and_user(
+            session,
+            email="ser-admin@example.com",
+            in_app_id="u1",
+            paymail="wallet1",
+        )
 
     def test_nft_to_json_and_str(self):
-        now = datetime.now(timezone.utc)
         with self.Session() as session:
-            admin = Admin(email="ser-admin@example.com", password_hash="x")
-            session.add(admin)
-            session.flush()
-
             nft = NFTDefinition(
                 prefix="SER",
                 shared_key="shared",
@@ -34,9 +28,9 @@ class SerializationTestCase(unittest.TestCase):
                 nft_type="default",
                 category="cat",
                 subcategory="sub",
-                created_by_admin_id=admin.id,
-                created_at=now,
-                updated_at=now,
+                created_by_admin_id=self.admin_id,
+                created_at=NOW,
+                updated_at=NOW,
             )
             session.add(nft)
             session.flush()
@@ -59,12 +53,7 @@ class SerializationTestCase(unittest.TestCase):
             self.assertEqual(parsed, d)
 
     def test_bingocell_to_json_and_str(self):
-        now = datetime.now(timezone.utc)
         with self.Session() as session:
-            admin = Admin(email="cell-admin@example.com", password_hash="x")
-            session.add(admin)
-            session.flush()
-
             nft = NFTDefinition(
                 prefix="CELL",
                 shared_key="shared",
@@ -72,13 +61,12 @@ class SerializationTestCase(unittest.TestCase):
                 nft_type="default",
                 category="cat",
                 subcategory="subc",
-                created_by_admin_id=admin.id,
-                created_at=now,
-                updated_at=now,
+                created_by_admin_id=self.admin_id,
+                created_at=NOW,
+                updated_at=NOW,
             )
-            user = User(in_app_id="u1", paymail="wallet1")
-            card = BingoCard(user_id=1, issued_at=now)
-            session.add_all([nft, user, card])
+            card = BingoCard(user_id=self.user_id, issued_at=NOW)
+            session.add_all([nft, card])
             session.flush()
 
             cell = BingoCell(
@@ -105,45 +93,61 @@ class SerializationTestCase(unittest.TestCase):
             self.assertEqual(parsed, d)
 
     def test_bingocard_to_json_and_str(self):
-        now = datetime.now(timezone.utc)
         with self.Session() as session:
-            admin = Admin(email="card-admin@example.com", password_hash="x")
-            session.add(admin)
-            session.flush()
-
             # Create 9 NFTDefinition definitions
-            definitions = []
-            for i in range(9):
-                nft = NFTDefinition(
-                    prefix=f"T{i}",
-                    shared_key=f"shared-{i}",
-                    name=f"T{i}",
-                    nft_type="default",
-                    category="cat",
-                    subcategory=f"s{i}",
-                    created_by_admin_id=admin.id,
-                    created_at=now,
-                    updated_at=now,
-                )
-                definitions.append(nft)
-            user = User(in_app_id="u1", paymail="wallet1")
-            card = BingoCard(user_id=1, issued_at=now)
-            session.add_all(definitions + [user, card])
+            definitions = session.scalars(
+                insert(NFTDefinition).returning(
+                    NFTDefinition, sort_by_parameter_order=True
+                ),
+                [
+                    {
+                        "prefix": f"T{i}",
+                        "shared_key": f"shared-{i}",
+                        "name": f"T{i}",
+                        "nft_type": "default",
+                        "category": "cat",
+                        "subcategory": f"s{i}",
+                        "created_by_admin_id": self.admin_id,
+                        "created_at": NOW,
+                        "updated_at": NOW,
+                    }
+                    for i in range(9)
+                ],
+            ).all()
+            card = BingoCard(user_id=self.user_id, issued_at=NOW)
+            session.add(card)
             session.flush()
 
             # Add 9 cells
-            for i, nft in enumerate(definitions):
-                cell = BingoCell(
-                    bingo_card_id=card.id,
-                    idx=i,
-                    target_definition_id=nft.id,
-                    state="locked",
+            session.execute(
+                insert(BingoCell),
+                [
+                    {
+                        "bingo_card_id": card.id,
+                        "idx": i,
+                        "target_definition_id": nft.id,
+                        "state": "locked",
+                    }
+                    for i, nft in enumerate(definitions)
+                ],
+            )
+
+            # Load the whole card graph up front; raiseload turns any lazy
+            # load left inside to_json() into an error instead of an N+1.
+            card = session.scalars(
+                select(BingoCard)
+                .where(BingoCard.id == card.id)
+                .options(
+                    selectinload(BingoCard.cells).selectinload(
+                        BingoCell.target_definition
+                    ),
+                    raiseload("*"),
                 )
-                session.add(cell)
-            session.flush()
+                .execution_options(populate_existing=True)
+            ).one()
 
             d = card.to_json()
-            self.assertEqual(d["user_id"], 1)
+            self.assertEqual(d["user_id"], self.user_id)
             self.assertEqual(d["state"], "active")
             self.assertIsInstance(d["issued_at"], str)
             # Should have 9 cells
@@ -159,6 +163,35 @@ class SerializationTestCase(unittest.TestCase):
             parsed = json.loads(s)
             self.assertEqual(parsed, d)
 
+    def test_bingocard_to_json_with_unflushed_and_shared_definitions(self):
+        def definition(prefix):
+            return NFTDefinition(
+                prefix=prefix,
+                shared_key=f"shared-{prefix}",
+                name=prefix,
+                nft_type="default",
+                created_by_admin_id=self.admin_id,
+            )
+
+        # Nothing is flushed, so every definition id is still None.
+        unflushed = [definition(f"N{i}") for i in range(3)]
+        shared = definition("S")
+        targets = unflushed + [shared, shared]
+        card = BingoCard(user_id=self.user_id, issued_at=NOW)
+        for i, target in enumerate(targets):
+            cell = BingoCell(bingo_card_id=None, idx=i, target_definition_id=None)
+            cell.target_definition = target
+            card.cells.append(cell)
+
+        cells = card.to_json()["cells"]
+        self.assertEqual(
+            [c["target_definition"]["prefix"] for c in cells],
+            ["N0", "N1", "N2", "S", "S"],
+        )
+        # Cells sharing a definition get independent dicts.
+        cells[3]["target_definition"]["name"] = "edited"
+        self.assertEqual(cells[4]["target_definition"]["name"], "S")
+
 
 if __name__ == "__main__":
     unittest.main()
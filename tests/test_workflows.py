@@ -1,11 +1,13 @@
 import unittest
 from typing import Any, Optional
+from unittest.mock import Mock
 
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import Session
+
+from tests.db_fixture import SqliteInMemoryTestCase, seed_admin_and_user
 
 from nictbw.blockchain.api import ChainClient
-from nictbw.models import Admin, Base, NFTDefinition, NFTInstance, NFTTemplate, User
+from nictbw.models import NFTDefinition, NFTInstance, NFTTemplate, User
 from nictbw.workflows import create_and_issue_instance, register_user
 
 
@@ -34,17 +36,7 @@ class DummyClient(ChainClient):
         return self.response
 
 
-class RegisterUserWorkflowTestCase(unittest.TestCase):
-    def setUp(self):
-        self.engine = create_engine("sqlite+pysqlite:///:memory:", future=True)
-        Base.metadata.create_all(self.engine)
-        self.Session = sessionmaker(
-            bind=self.engine, future=True, expire_on_commit=False
-        )
-
-    def tearDown(self):
-        self.engine.dispose()
-
+class RegisterUserWorkflowTestCase(SqliteInMemoryTestCase):
     def test_register_user_populates_paymail(self):
         client = DummyClient(
             {
@@ -72,66 +64,67 @@ class RegisterUserWorkflowTestCase(unittest.TestCase):
         self.assertEqual(client.calls[0]["password"], "securepassword")
         self.assertEqual(client.calls[0]["email"], "anemail@example.com")
 
+
+class RegisterUserFailureTestCase(unittest.TestCase):
+    # Failed sign-ups raise before anything is persisted, so no database is
+    # needed.
     def test_register_user_requires_paymail_in_response(self):
         client = DummyClient({"status": "success", "message": "missing paymail"})
+        session = Mock(spec=Session)
 
-        with self.Session.begin() as session:
-            user = User(in_app_id="user-no-paymail", paymail=None)
-            with self.assertRaises(ValueError):
-                register_user(
-                    session,
-                    user,
-                    password="securepassword",
-                    email="user@example.com",
-                    client=client,
-                )
+        user = User(in_app_id="user-no-paymail", paymail=None)
+        with self.assertRaises(ValueError):
+            register_user(
+                session,
+                user,
+                password="securepassword",
+                email="user@example.com",
+                client=client,
+            )
 
         self.assertEqual(len(client.calls), 1)
+        self.assertEqual(session.method_calls, [])
 
     def test_register_user_uses_in_app_id_as_default_username(self):
         client = DummyClient({"status": "error", "message": "username taken"})
+        session = Mock(spec=Session)
 
-        with self.Session.begin() as session:
-            user = User(in_app_id="fallback-user", paymail=None)
-            with self.assertRaises(RuntimeError):
-                register_user(
-                    session,
-                    user,
-                    password="securepassword",
-                    email="user@example.com",
-                    client=client,
-                )
+        user = User(in_app_id="fallback-user", paymail=None)
+        with self.assertRaises(RuntimeError):
+            register_user(
+                session,
+                user,
+                password="securepassword",
+                email="user@example.com",
+                client=client,
+            )
 
         self.assertEqual(len(client.calls), 1)
         self.assertEqual(client.calls[0]["username"], "fallback-user")
+        self.assertEqual(session.method_calls, [])
 
 
-class CreateAndIssueInstanceWorkflowTestCase(unittest.TestCase):
-    def setUp(self):
-        self.engine = create_engine("sqlite+pysqlite:///:memory:", future=True)
-        Base.metadata.create_all(self.engine)
-        self.Session = sessionmaker(
-            bind=self.engine, future=True, expire_on_commit=False
+class CreateAndIssueInstanceWorkflowTestCase(SqliteInMemoryTestCase):
+    @classmethod
+    def seed_fixtures(cls, session):
+        cls.admin_id, cls.user_id = seed_admin_and_user(
+            session,
+            email="wf-admin@example.com",
+            in_app_id="wf-user",
+            paymail="wf-user@wallet",
         )
 
-    def tearDown(self):
-        self.engine.dispose()
-
     def test_returns_instance_for_definition_input(self):
         with self.Session.begin() as session:
-            admin = Admin(email="wf-admin@example.com", password_hash="x")
-            user = User(in_app_id="wf-user", paymail="wf-user@wallet")
-            session.add_all([admin, user])
-            session.flush()
+            user = session.get(User, self.user_id)
             definition = NFTDefinition(
                 prefix="WF",
                 shared_key="wf-key",
                 name="WF NFT",
                 nft_type="default",
-                created_by_admin_id=admin.id,
+                created_by_admin_id=self.admin_id,
             )
             session.add(definition)
-            session.flush()
 
             instance = create_and_issue_instance(
                 session=session,
@@ -148,18 +141,14 @@ class CreateAndIssueInstanceWorkflowTestCase(unittest.TestCase):
 
     def test_template_input_requires_shared_key(self):
         with self.Session.begin() as session:
-            admin = Admin(email="wf-admin-template@example.com", password_hash="x")
-            user = User(in_app_id="wf-user-template", paymail="wf-user-template@wallet")
-            session.add_all([admin, user])
-            session.flush()
+            user = session.get(User, self.user_id)
             template = NFTTemplate(
                 prefix="WFT",
                 name="WF Template",
                 category="event",
-                created_by_admin_id=admin.id,
+                created_by_admin_id=self.admin_id,
             )
             session.add(template)
-            session.flush()
 
             with self.assertRaises(ValueError):
                 create_and_issue_instance(
@@ -171,18 +160,14 @@ class CreateAndIssueInstanceWorkflowTestCase(unittest.TestCase):
 
     def test_template_input_returns_instance(self):
         with self.Session.begin() as session:
-            admin = Admin(email="wf-admin-template2@example.com", password_hash="x")
-            user = User(in_app_id="wf-user-template2", paymail="wf-user-template2@wallet")
-            session.add_all([admin, user])
-            session.flush()
+            user = session.get(User, self.user_id)
             template = NFTTemplate(
                 prefix="WFT2",
                 name="WF Template 2",
                 category="event",
-                created_by_admin_id=admin.id,
+                created_by_admin_id=self.admin_id,
             )
             session.add(template)
-            session.flush()
 
             instance = create_and_issue_instance(
                 session=session,